@@ -37,6 +37,9 @@ The backend can be chosen at the beginning of the program by using the following
 
 where name is one of 'cuda', 'opencl' or 'cpu'.
 
+The libraries are loaded on first use. To load only one backend, set the environment variable
+AF_BACKEND to one of 'unified', 'cuda', 'opencl' or 'cpu' before starting the program.
+
 The functionality provided by ArrayFire spans the following domains:
 
     1. Vector Algorithms
@@ -48,10 +51,7 @@ The functionality provided by ArrayFire spans the following domains:
 
 """
 
-try:
-    import pycuda.autoinit
-except ImportError:
-    pass
+import sys as _sys
 
 from .library    import *
 from .array      import *
@@ -65,21 +65,93 @@ from .statistics import *
 from .lapack     import *
 from .signal     import *
 from .image      import *
-from .features   import *
-from .vision     import *
-from .graphics   import *
 from .bcast      import *
 from .index      import *
-from .interop    import *
 from .timer      import *
 from .random     import *
-from .sparse     import *
+from .parallel   import *
+from .trace      import *
 
 # do not export default modules as part of arrayfire
 del ct
-del inspect
 del numbers
 del os
 
-if (AF_NUMPY_FOUND):
-    del np
+# The following modules are imported on first access, e.g. af.Window or af.sparse.
+# This keeps "import arrayfire" fast and avoids importing the optional interop packages.
+_lazy_modules = ('aio', 'cuda', 'external', 'features', 'graphics', 'interop', 'linalg', 'opencl',
+                 'sparse', 'stats', 'vision')
+
+_lazy_attrs = {'Window'                     : 'graphics',
+               'Features'                   : 'features',
+               'fast'                       : 'vision',
+               'harris'                     : 'vision',
+               'orb'                        : 'vision',
+               'hamming_matcher'            : 'vision',
+               'nearest_neighbour'          : 'vision',
+               'match_template'             : 'vision',
+               'susan'                      : 'vision',
+               'dog'                        : 'vision',
+               'sift'                       : 'vision',
+               'gloh'                       : 'vision',
+               'homography'                 : 'vision',
+               'create_sparse'              : 'sparse',
+               'create_sparse_from_host'    : 'sparse',
+               'create_sparse_from_dense'   : 'sparse',
+               'convert_sparse_to_dense'    : 'sparse',
+               'sparse_get_info'            : 'sparse',
+               'sparse_get_values'          : 'sparse',
+               'sparse_get_row_idx'         : 'sparse',
+               'sparse_get_col_idx'         : 'sparse',
+               'sparse_get_nnz'             : 'sparse',
+               'sparse_get_storage'         : 'sparse',
+               'convert_sparse'             : 'sparse',
+               'sparse_scale'               : 'sparse',
+               'sparse_apply'               : 'sparse',
+               'sparse_scale_rows'          : 'sparse',
+               'sparse_scale_cols'          : 'sparse',
+               'sparse_add'                 : 'sparse',
+               'sparse_reduce_rows'         : 'sparse',
+               'from_scipy'                 : 'sparse',
+               'to_scipy'                   : 'sparse',
+               'assemble'                   : 'sparse',
+               'AF_NUMPY_FOUND'             : 'interop',
+               'AF_PYCUDA_FOUND'            : 'interop',
+               'AF_PYOPENCL_FOUND'          : 'interop',
+               'AF_NUMBA_FOUND'             : 'interop',
+               'np_to_af_array'             : 'interop',
+               'from_ndarray'               : 'interop',
+               'pycuda_to_af_array'         : 'interop',
+               'pyopencl_to_af_array'       : 'interop',
+               'numba_to_af_array'          : 'interop',
+               'to_array'                   : 'interop'}
+
+__all__ = ([_name for _name in globals() if not _name.startswith('_')] +
+           list(_lazy_modules) + list(_lazy_attrs))
+
+def __getattr__(name):
+    import importlib
+    if name in _lazy_modules:
+        return importlib.import_module('.' + name, __name__)
+    if name in _lazy_attrs:
+        mod = importlib.import_module('.' + _lazy_attrs[name], __name__)
+        val = getattr(mod, name)
+        globals()[name] = val
+        return val
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_modules) | set(_lazy_attrs))
+
+if _sys.version_info < (3, 7):
+    # Module level __getattr__ is not supported, import everything up front.
+    from . import aio, external, interop, linalg, stats
+    from .features   import *
+    from .vision     import *
+    from .graphics   import *
+    from .interop    import *
+    from .sparse     import *
+    # Brought back by the imports above
+    del ct
+    del numbers
+    del os
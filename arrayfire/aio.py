@@ -0,0 +1,152 @@
+#######################################################
+# Copyright (c) 2015, ArrayFire
+# All rights reserved.
+#
+# This file is distributed under 3-clause BSD license.
+# The complete license agreement can be obtained at:
+# http://arrayfire.com/licenses/BSD-3-Clause
+########################################################
+
+"""
+Awaitable versions of blocking functions, for use with asyncio.
+
+The blocking library calls are run on an executor so the event loop stays responsive
+while the device is busy.
+
+    >>> import arrayfire as af
+    >>> async def handler(a):
+    ...     b = af.matmul(a, a)
+    ...     await af.aio.eval(b)
+    ...     return await af.aio.to_ndarray(b)
+
+"""
+
+from .library import *
+from .array import *
+from .device import (get_device, set_device)
+from .device import sync as _sync
+from .device import eval as _eval
+
+_executor = None
+
+def set_executor(executor):
+    """
+    Set the executor used to run the blocking calls.
+
+    Parameters
+    ----------
+    executor : concurrent.futures.Executor or None.
+             - If None, the default executor of the event loop is used.
+    """
+    global _executor
+    _executor = executor
+
+def get_executor():
+    """
+    Get the executor used to run the blocking calls.
+
+    Returns
+    -------
+    executor : concurrent.futures.Executor or None.
+             None if the default executor of the event loop is used.
+    """
+    return _executor
+
+def _run_on_device(bk_name, dev, func, args):
+    with backend_scope(bk_name, unsafe=True):
+        if (get_device() != dev):
+            set_device(dev)
+        return func(*args)
+
+def run(func, *args):
+    """
+    Run a blocking function on the executor.
+
+    Parameters
+    ----------
+    func : callable.
+         The function to be called.
+
+    *args : arguments to `func`.
+
+    Returns
+    -------
+    fut : asyncio.Future
+        Awaitable that resolves to `func(*args)`.
+
+    Note
+    ----
+    - Must be called from a coroutine or callback running in the event loop.
+    - `func` runs with the backend and device that are active in the calling thread.
+    """
+    import asyncio
+    # get_running_loop was added in python 3.7
+    loop = getattr(asyncio, 'get_running_loop', asyncio.get_event_loop)()
+    return loop.run_in_executor(_executor, _run_on_device,
+                                get_active_backend(), get_device(), func, args)
+
+def _eval_and_sync(*args):
+    _eval(*args)
+    _sync()
+
+def sync(device=None):
+    """
+    Awaitable version of `af.sync`.
+
+    Parameters
+    -----------
+    device: optional: int. default: None.
+         id of the desired device.
+    """
+    return run(_sync, device)
+
+def eval(*args):
+    """
+    Awaitable version of `af.eval`.
+
+    Resolves once the inputs have been evaluated and the device is idle.
+
+    Parameters
+    -----------
+    args : arrays to be evaluated
+    """
+    for arg in args:
+        if not isinstance(arg, Array):
+            raise RuntimeError("All inputs to eval must be of type arrayfire.Array")
+
+    return run(_eval_and_sync, *args)
+
+def to_ndarray(a, output=None):
+    """
+    Awaitable version of `af.Array.to_ndarray`.
+
+    Parameters
+    -----------
+    a : af.Array
+
+    output: optional: numpy. default: None
+    """
+    return run(a.to_ndarray, output)
+
+def to_list(a, row_major=False):
+    """
+    Awaitable version of `af.Array.to_list`.
+
+    Parameters
+    -----------
+    a : af.Array
+
+    row_major: optional: bool. default: False.
+        Specifies if a transpose needs to occur before copying to host memory.
+    """
+    return run(a.to_list, row_major)
+
+def scalar(a):
+    """
+    Awaitable version of `af.Array.scalar`.
+
+    Parameters
+    -----------
+    a : af.Array
+    """
+    return run(a.scalar)
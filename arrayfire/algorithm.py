@@ -29,6 +29,13 @@ def _reduce_all(a, c_func):
     imag = imag.value
     return real if imag == 0 else real + imag * 1j
 
+def _reduce_all_lazy(a, c_func, *args):
+    flat = Array()
+    safe_call(backend.get().af_flat(c_pointer(flat.arr), a.arr))
+    out = DeviceScalar()
+    safe_call(c_func(c_pointer(out.arr), flat.arr, c_int_t(0), *args))
+    return out
+
 def _nan_parallel_dim(a, dim, c_func, nan_val):
     out = Array()
     safe_call(c_func(c_pointer(out.arr), a.arr, c_int_t(dim), c_double_t(nan_val)))
@@ -44,7 +51,7 @@ def _nan_reduce_all(a, c_func, nan_val):
     imag = imag.value
     return real if imag == 0 else real + imag * 1j
 
-def sum(a, dim=None, nan_val=None):
+def sum(a, dim=None, nan_val=None, lazy=False):
     """
     Calculate the sum of all the elements along a specified dimension.
 
@@ -56,10 +63,13 @@ def sum(a, dim=None, nan_val=None):
          Dimension along which the sum is required.
     nan_val: optional: scalar. default: None
          The value that replaces NaN in the array
+    lazy: optional: bool. default: False
+         Only used when `dim` is `None`. If True, the result is returned as an
+         af.DeviceScalar that stays on the device, instead of a python number.
 
     Returns
     -------
-    out: af.Array or scalar number
+    out: af.Array, af.DeviceScalar or scalar number
          The sum of all elements in `a` along dimension `dim`.
          If `dim` is `None`, sum of the entire Array is returned.
     """
@@ -67,14 +77,18 @@ def sum(a, dim=None, nan_val=None):
         if dim is not None:
             return _nan_parallel_dim(a, dim, backend.get().af_sum_nan, nan_val)
         else:
+            if lazy:
+                return _reduce_all_lazy(a, backend.get().af_sum_nan, c_double_t(nan_val))
             return _nan_reduce_all(a, backend.get().af_sum_nan_all, nan_val)
     else:
         if dim is not None:
             return _parallel_dim(a, dim, backend.get().af_sum)
         else:
+            if lazy:
+                return _reduce_all_lazy(a, backend.get().af_sum)
             return _reduce_all(a, backend.get().af_sum_all)
 
-def product(a, dim=None, nan_val=None):
+def product(a, dim=None, nan_val=None, lazy=False):
     """
     Calculate the product of all the elements along a specified dimension.
 
@@ -86,10 +100,13 @@ def product(a, dim=None, nan_val=None):
          Dimension along which the product is required.
     nan_val: optional: scalar. default: None
          The value that replaces NaN in the array
+    lazy: optional: bool. default: False
+         Only used when `dim` is `None`. If True, the result is returned as an
+         af.DeviceScalar that stays on the device, instead of a python number.
 
     Returns
     -------
-    out: af.Array or scalar number
+    out: af.Array, af.DeviceScalar or scalar number
          The product of all elements in `a` along dimension `dim`.
          If `dim` is `None`, product of the entire Array is returned.
     """
@@ -97,14 +114,18 @@ def product(a, dim=None, nan_val=None):
         if dim is not None:
             return _nan_parallel_dim(a, dim, backend.get().af_product_nan, nan_val)
         else:
+            if lazy:
+                return _reduce_all_lazy(a, backend.get().af_product_nan, c_double_t(nan_val))
             return _nan_reduce_all(a, backend.get().af_product_nan_all, nan_val)
     else:
         if dim is not None:
             return _parallel_dim(a, dim, backend.get().af_product)
         else:
+            if lazy:
+                return _reduce_all_lazy(a, backend.get().af_product)
             return _reduce_all(a, backend.get().af_product_all)
 
-def min(a, dim=None):
+def min(a, dim=None, lazy=False):
     """
     Find the minimum value of all the elements along a specified dimension.
 
@@ -114,19 +135,24 @@ def min(a, dim=None):
          Multi dimensional arrayfire array.
     dim: optional: int. default: None
          Dimension along which the minimum value is required.
+    lazy: optional: bool. default: False
+         Only used when `dim` is `None`. If True, the result is returned as an
+         af.DeviceScalar that stays on the device, instead of a python number.
 
     Returns
     -------
-    out: af.Array or scalar number
+    out: af.Array, af.DeviceScalar or scalar number
          The minimum value of all elements in `a` along dimension `dim`.
          If `dim` is `None`, minimum value of the entire Array is returned.
     """
     if dim is not None:
         return _parallel_dim(a, dim, backend.get().af_min)
     else:
+        if lazy:
+            return _reduce_all_lazy(a, backend.get().af_min)
         return _reduce_all(a, backend.get().af_min_all)
 
-def max(a, dim=None):
+def max(a, dim=None, lazy=False):
     """
     Find the maximum value of all the elements along a specified dimension.
 
@@ -136,19 +162,24 @@ def max(a, dim=None):
          Multi dimensional arrayfire array.
     dim: optional: int. default: None
          Dimension along which the maximum value is required.
+    lazy: optional: bool. default: False
+         Only used when `dim` is `None`. If True, the result is returned as an
+         af.DeviceScalar that stays on the device, instead of a python number.
 
     Returns
     -------
-    out: af.Array or scalar number
+    out: af.Array, af.DeviceScalar or scalar number
          The maximum value of all elements in `a` along dimension `dim`.
          If `dim` is `None`, maximum value of the entire Array is returned.
     """
     if dim is not None:
         return _parallel_dim(a, dim, backend.get().af_max)
     else:
+        if lazy:
+            return _reduce_all_lazy(a, backend.get().af_max)
         return _reduce_all(a, backend.get().af_max_all)
 
-def all_true(a, dim=None):
+def all_true(a, dim=None, lazy=False):
     """
     Check if all the elements along a specified dimension are true.
 
@@ -158,19 +189,24 @@ def all_true(a, dim=None):
          Multi dimensional arrayfire array.
     dim: optional: int. default: None
          Dimension along which the product is required.
+    lazy: optional: bool. default: False
+         Only used when `dim` is `None`. If True, the result is returned as an
+         af.DeviceScalar that stays on the device, instead of a python number.
 
     Returns
     -------
-    out: af.Array or scalar number
+    out: af.Array, af.DeviceScalar or scalar number
          Af.array containing True if all elements in `a` along the dimension are True.
          If `dim` is `None`, output is True if `a` does not have any zeros, else False.
     """
     if dim is not None:
         return _parallel_dim(a, dim, backend.get().af_all_true)
     else:
+        if lazy:
+            return _reduce_all_lazy(a, backend.get().af_all_true)
         return _reduce_all(a, backend.get().af_all_true_all)
 
-def any_true(a, dim=None):
+def any_true(a, dim=None, lazy=False):
     """
     Check if any the elements along a specified dimension are true.
 
@@ -180,19 +216,24 @@ def any_true(a, dim=None):
          Multi dimensional arrayfire array.
     dim: optional: int. default: None
          Dimension along which the product is required.
+    lazy: optional: bool. default: False
+         Only used when `dim` is `None`. If True, the result is returned as an
+         af.DeviceScalar that stays on the device, instead of a python number.
 
     Returns
     -------
-    out: af.Array or scalar number
+    out: af.Array, af.DeviceScalar or scalar number
          Af.array containing True if any elements in `a` along the dimension are True.
          If `dim` is `None`, output is True if `a` does not have any zeros, else False.
     """
     if dim is not None:
         return _parallel_dim(a, dim, backend.get().af_any_true)
     else:
+        if lazy:
+            return _reduce_all_lazy(a, backend.get().af_any_true)
         return _reduce_all(a, backend.get().af_any_true_all)
 
-def count(a, dim=None):
+def count(a, dim=None, lazy=False):
     """
     Count the number of non zero elements in an array along a specified dimension.
 
@@ -202,16 +243,21 @@ def count(a, dim=None):
          Multi dimensional arrayfire array.
     dim: optional: int. default: None
          Dimension along which the the non zero elements are to be counted.
+    lazy: optional: bool. default: False
+         Only used when `dim` is `None`. If True, the result is returned as an
+         af.DeviceScalar that stays on the device, instead of a python number.
 
     Returns
     -------
-    out: af.Array or scalar number
+    out: af.Array, af.DeviceScalar or scalar number
          The count of non zero elements in `a` along `dim`.
          If `dim` is `None`, the total number of non zero elements in `a`.
     """
     if dim is not None:
         return _parallel_dim(a, dim, backend.get().af_count)
     else:
+        if lazy:
+            return _reduce_all_lazy(a, backend.get().af_count)
         return _reduce_all(a, backend.get().af_count_all)
 
 def imin(a, dim=None):
@@ -364,6 +410,193 @@ def scan_by_key(key, a, dim=0, op=BINARYOP.ADD, inclusive_scan=True):
     safe_call(backend.get().af_scan_by_key(c_pointer(out.arr), key.arr, a.arr, dim, op.value, inclusive_scan))
     return out
 
+def _keys_like(keys, vals, dim):
+    vdims = vals._dims4()
+    kdims = [1, 1, 1, 1]
+    kdims[dim] = vdims[dim]
+
+    out = Array()
+    c_dims = dim4(kdims[0], kdims[1], kdims[2], kdims[3])
+    safe_call(backend.get().af_moddims(c_pointer(out.arr), keys.arr, 4, c_pointer(c_dims)))
+    if tuple(kdims) == vdims:
+        return out
+
+    reps = list(vdims)
+    reps[dim] = 1
+    tiled = Array()
+    safe_call(backend.get().af_tile(c_pointer(tiled.arr), out.arr, reps[0], reps[1], reps[2], reps[3]))
+    return tiled
+
+def _lookup(a, idx, dim):
+    out = Array()
+    safe_call(backend.get().af_lookup(c_pointer(out.arr), a.arr, idx.arr, c_int_t(dim)))
+    return out
+
+def _run_flags(sorted_keys, pad, at_end=False):
+    """
+    Flags that are True where the sorted keys change, with `pad` added at the start (or end).
+    """
+    num = sorted_keys.elements()
+    padding = Array()
+    padding.arr = constant_array(pad, min(num, 1), 1, 1, 1, Dtype.b8)
+    if num < 2:
+        return padding
+
+    neq = diff1(sorted_keys, 0) != 0
+    out = Array()
+    if at_end:
+        safe_call(backend.get().af_join(c_pointer(out.arr), 0, neq.arr, padding.arr))
+    else:
+        safe_call(backend.get().af_join(c_pointer(out.arr), 0, padding.arr, neq.arr))
+    return out
+
+def _reduce_by_key(keys, vals, dim, is_sorted, c_name, op):
+    if keys.numdims() > 1:
+        flat_keys = Array()
+        safe_call(backend.get().af_flat(c_pointer(flat_keys.arr), keys.arr))
+        keys = flat_keys
+
+    if not is_sorted:
+        keys, idx = sort_index(keys)
+        vals = _lookup(vals, idx, dim)
+
+    c_func = getattr(backend.get(), c_name, None)
+    if c_func is not None:
+        keys_out = Array()
+        vals_out = Array()
+        safe_call(c_func(c_pointer(keys_out.arr), c_pointer(vals_out.arr),
+                         keys.arr, vals.arr, c_int_t(dim)))
+        return keys_out, vals_out
+
+    # Older versions of arrayfire: scan each segment and pick the last element of each segment
+    if c_name == 'af_count_by_key':
+        vals = (vals != 0).as_type(Dtype.u32)
+
+    last = _run_flags(keys, True, at_end=True)
+    idx = where(last)
+    scanned = scan_by_key(_keys_like(keys, vals, dim), vals, dim, op, True)
+    return _lookup(keys, idx, 0), _lookup(scanned, idx, dim)
+
+def sum_by_key(keys, vals, dim=0, is_sorted=False):
+    """
+    Calculate the sum of the values for each run of equal keys.
+
+    Parameters
+    ----------
+    keys : af.Array
+         A 1D arrayfire array with one key for each element of `vals` along `dim`.
+    vals : af.Array
+         Multi dimensional arrayfire array.
+    dim: optional: int. default: 0
+         Dimension of `vals` along which the keys are laid out.
+    is_sorted: optional: bool. default: False
+         Specifies if equal keys are already next to each other.
+         If False, the keys are sorted first.
+
+    Returns
+    -------
+    (keys_out, vals_out): tuple of af.Array
+         `keys_out` contains one key for each run of equal keys.
+         `vals_out` contains the sum of the values of each run along `dim`.
+    """
+    return _reduce_by_key(keys, vals, dim, is_sorted, 'af_sum_by_key', BINARYOP.ADD)
+
+def product_by_key(keys, vals, dim=0, is_sorted=False):
+    """
+    Calculate the product of the values for each run of equal keys.
+
+    Parameters
+    ----------
+    keys : af.Array
+         A 1D arrayfire array with one key for each element of `vals` along `dim`.
+    vals : af.Array
+         Multi dimensional arrayfire array.
+    dim: optional: int. default: 0
+         Dimension of `vals` along which the keys are laid out.
+    is_sorted: optional: bool. default: False
+         Specifies if equal keys are already next to each other.
+         If False, the keys are sorted first.
+
+    Returns
+    -------
+    (keys_out, vals_out): tuple of af.Array
+         `keys_out` contains one key for each run of equal keys.
+         `vals_out` contains the product of the values of each run along `dim`.
+    """
+    return _reduce_by_key(keys, vals, dim, is_sorted, 'af_product_by_key', BINARYOP.MUL)
+
+def min_by_key(keys, vals, dim=0, is_sorted=False):
+    """
+    Find the minimum value for each run of equal keys.
+
+    Parameters
+    ----------
+    keys : af.Array
+         A 1D arrayfire array with one key for each element of `vals` along `dim`.
+    vals : af.Array
+         Multi dimensional arrayfire array.
+    dim: optional: int. default: 0
+         Dimension of `vals` along which the keys are laid out.
+    is_sorted: optional: bool. default: False
+         Specifies if equal keys are already next to each other.
+         If False, the keys are sorted first.
+
+    Returns
+    -------
+    (keys_out, vals_out): tuple of af.Array
+         `keys_out` contains one key for each run of equal keys.
+         `vals_out` contains the minimum value of each run along `dim`.
+    """
+    return _reduce_by_key(keys, vals, dim, is_sorted, 'af_min_by_key', BINARYOP.MIN)
+
+def max_by_key(keys, vals, dim=0, is_sorted=False):
+    """
+    Find the maximum value for each run of equal keys.
+
+    Parameters
+    ----------
+    keys : af.Array
+         A 1D arrayfire array with one key for each element of `vals` along `dim`.
+    vals : af.Array
+         Multi dimensional arrayfire array.
+    dim: optional: int. default: 0
+         Dimension of `vals` along which the keys are laid out.
+    is_sorted: optional: bool. default: False
+         Specifies if equal keys are already next to each other.
+         If False, the keys are sorted first.
+
+    Returns
+    -------
+    (keys_out, vals_out): tuple of af.Array
+         `keys_out` contains one key for each run of equal keys.
+         `vals_out` contains the maximum value of each run along `dim`.
+    """
+    return _reduce_by_key(keys, vals, dim, is_sorted, 'af_max_by_key', BINARYOP.MAX)
+
+def count_by_key(keys, vals, dim=0, is_sorted=False):
+    """
+    Count the number of non zero values for each run of equal keys.
+
+    Parameters
+    ----------
+    keys : af.Array
+         A 1D arrayfire array with one key for each element of `vals` along `dim`.
+    vals : af.Array
+         Multi dimensional arrayfire array.
+    dim: optional: int. default: 0
+         Dimension of `vals` along which the keys are laid out.
+    is_sorted: optional: bool. default: False
+         Specifies if equal keys are already next to each other.
+         If False, the keys are sorted first.
+
+    Returns
+    -------
+    (keys_out, vals_out): tuple of af.Array
+         `keys_out` contains one key for each run of equal keys.
+         `vals_out` contains the number of non zero values of each run along `dim`.
+    """
+    return _reduce_by_key(keys, vals, dim, is_sorted, 'af_count_by_key', BINARYOP.ADD)
+
 def where(a):
     """
     Find the indices of non zero elements
@@ -567,3 +800,58 @@ def set_intersect(a, b, is_unique=False):
     out = Array()
     safe_call(backend.get().af_set_intersect(c_pointer(out.arr), a.arr, b.arr, c_bool_t(is_unique)))
     return out
+
+def unique(a, return_index=False, return_inverse=False, return_counts=False):
+    """
+    Find the unique elements of an array, and optionally where they occur.
+
+    Everything is computed from a single sort of `a`.
+
+    Parameters
+    ----------
+    a  : af.Array
+         Multi dimensional arrayfire array. It is treated as a 1D array.
+    return_index: optional: bool. default: False
+         Also return the index of the first occurrence of every unique value.
+    return_inverse: optional: bool. default: False
+         Also return the index of the unique value of every element of `a`.
+    return_counts: optional: bool. default: False
+         Also return the number of occurrences of every unique value.
+
+    Returns
+    -------
+    out: af.Array
+         The sorted unique values, if none of the optional outputs are requested.
+
+    (out, index, inverse, counts): tuple of af.Array
+         The sorted unique values followed by the requested outputs, in this order.
+         The optional outputs are of type u32.
+    """
+    flat = Array()
+    safe_call(backend.get().af_flat(c_pointer(flat.arr), a.arr))
+    sorted_a, perm = sort_index(flat)
+
+    starts = where(_run_flags(sorted_a, True))
+    out = [_lookup(sorted_a, starts, 0)]
+
+    if return_index or return_inverse:
+        # Index of the unique value of every sorted element
+        ids = scan(_run_flags(sorted_a, False).as_type(Dtype.u32))
+
+    if return_index:
+        out.append(min_by_key(ids, perm, is_sorted=True)[1])
+
+    if return_inverse:
+        inverse = Array()
+        inverse.arr = constant_array(0, flat.elements(), 1, 1, 1, Dtype.u32)
+        inverse[perm] = ids
+        out.append(inverse)
+
+    if return_counts:
+        end = Array()
+        end.arr = constant_array(flat.elements(), 1, 1, 1, 1, Dtype.u32)
+        bounds = Array()
+        safe_call(backend.get().af_join(c_pointer(bounds.arr), 0, starts.arr, end.arr))
+        out.append(diff1(bounds))
+
+    return out[0] if len(out) == 1 else tuple(out)
@@ -13,6 +13,7 @@ Math functions (sin, sqrt, exp, etc).
 
 from .library import *
 from .array import *
+from .array import _bcast_flag, _trace_var
 from .bcast import _bcast_var
 from .util import _is_number
 
@@ -26,27 +27,38 @@ def _arith_binary_func(lhs, rhs, c_func):
         raise TypeError("Atleast one input needs to be of type arrayfire.array")
 
     elif (is_left_array and is_right_array):
-        safe_call(c_func(c_pointer(out.arr), lhs.arr, rhs.arr, _bcast_var.get()))
+        lhs_arr = lhs
+        rhs_arr = rhs
+        bcast = _bcast_flag(lhs, rhs)
 
     elif (_is_number(rhs)):
-        ldims = dim4_to_tuple(lhs.dims())
+        ldims = lhs._dims4()
         rty = implicit_dtype(rhs, lhs.type())
-        other = Array()
-        other.arr = constant_array(rhs, ldims[0], ldims[1], ldims[2], ldims[3], rty)
-        safe_call(c_func(c_pointer(out.arr), lhs.arr, other.arr, _bcast_var.get()))
+        lhs_arr = lhs
+        rhs_arr = Array()
+        rhs_arr.arr = constant_array(rhs, ldims[0], ldims[1], ldims[2], ldims[3], rty)
+        bcast = _bcast_var.get()
 
     else:
-        rdims = dim4_to_tuple(rhs.dims())
+        rdims = rhs._dims4()
         lty = implicit_dtype(lhs, rhs.type())
-        other = Array()
-        other.arr = constant_array(lhs, rdims[0], rdims[1], rdims[2], rdims[3], lty)
-        safe_call(c_func(c_pointer(out.arr), other.arr, rhs.arr, _bcast_var.get()))
+        lhs_arr = Array()
+        lhs_arr.arr = constant_array(lhs, rdims[0], rdims[1], rdims[2], rdims[3], lty)
+        rhs_arr = rhs
+        bcast = _bcast_var.get()
+
+    safe_call(c_func(c_pointer(out.arr), lhs_arr.arr, rhs_arr.arr, bcast))
+
+    if _trace_var.tracer is not None:
+        _trace_var.tracer.record(c_func, out, (lhs_arr, rhs_arr), (bcast,))
 
     return out
 
 def _arith_unary_func(a, c_func):
     out = Array()
     safe_call(c_func(c_pointer(out.arr), a.arr))
+    if _trace_var.tracer is not None:
+        _trace_var.tracer.record(c_func, out, (a,), ())
     return out
 
 def cast(a, dtype):
@@ -75,7 +87,10 @@ def cast(a, dtype):
            array containing the values from `a` after converting to `dtype`.
     """
     out=Array()
-    safe_call(backend.get().af_cast(c_pointer(out.arr), a.arr, dtype.value))
+    c_func = backend.get().af_cast
+    safe_call(c_func(c_pointer(out.arr), a.arr, dtype.value))
+    if _trace_var.tracer is not None:
+        _trace_var.tracer.record(c_func, out, (a,), (dtype.value,))
     return out
 
 def minof(lhs, rhs):
@@ -98,7 +113,7 @@ def minof(lhs, rhs):
     Note
     -------
     - Atleast one of `lhs` and `rhs` needs to be af.Array.
-    - If `lhs` and `rhs` are both af.Array, they must be of same size.
+    - If `lhs` and `rhs` are both af.Array, they are broadcast to a common size.
     """
     return _arith_binary_func(lhs, rhs, backend.get().af_minof)
 
@@ -122,7 +137,7 @@ def maxof(lhs, rhs):
     Note
     -------
     - Atleast one of `lhs` and `rhs` needs to be af.Array.
-    - If `lhs` and `rhs` are both af.Array, they must be of same size.
+    - If `lhs` and `rhs` are both af.Array, they are broadcast to a common size.
     """
     return _arith_binary_func(lhs, rhs, backend.get().af_maxof)
 
@@ -147,20 +162,30 @@ def clamp(val, low, high):
     is_low_array = isinstance(low, Array)
     is_high_array = isinstance(high, Array)
 
-    vdims = dim4_to_tuple(val.dims())
+    vdims = val._dims4()
     vty = val.type()
 
+    bcast = _bcast_var.get()
+
     if not is_low_array:
-        low_arr = constant_array(low, vdims[0], vdims[1], vdims[2], vdims[3], vty)
+        low_arr = Array()
+        low_arr.arr = constant_array(low, vdims[0], vdims[1], vdims[2], vdims[3], vty)
     else:
-        low_arr = low.arr
+        low_arr = low
+        bcast = bcast or _bcast_flag(val, low)
 
     if not is_high_array:
-        high_arr = constant_array(high, vdims[0], vdims[1], vdims[2], vdims[3], vty)
+        high_arr = Array()
+        high_arr.arr = constant_array(high, vdims[0], vdims[1], vdims[2], vdims[3], vty)
     else:
-        high_arr = high.arr
+        high_arr = high
+        bcast = bcast or _bcast_flag(val, high)
+
+    c_func = backend.get().af_clamp
+    safe_call(c_func(c_pointer(out.arr), val.arr, low_arr.arr, high_arr.arr, bcast))
 
-    safe_call(backend.get().af_clamp(c_pointer(out.arr), val.arr, low_arr, high_arr, _bcast_var.get()))
+    if _trace_var.tracer is not None:
+        _trace_var.tracer.record(c_func, out, (val, low_arr, high_arr), (bcast,))
 
     return out
 
@@ -180,7 +205,7 @@ def mod(lhs, rhs):
     Note
     -------
     - Atleast one of `lhs` and `rhs` needs to be af.Array.
-    - If `lhs` and `rhs` are both af.Array, they must be of same size.
+    - If `lhs` and `rhs` are both af.Array, they are broadcast to a common size.
     """
     return _arith_binary_func(lhs, rhs, backend.get().af_mod)
 
@@ -204,7 +229,7 @@ def rem(lhs, rhs):
     Note
     -------
     - Atleast one of `lhs` and `rhs` needs to be af.Array.
-    - If `lhs` and `rhs` are both af.Array, they must be of same size.
+    - If `lhs` and `rhs` are both af.Array, they are broadcast to a common size.
     """
     return _arith_binary_func(lhs, rhs, backend.get().af_rem)
 
@@ -340,7 +365,7 @@ def hypot(lhs, rhs):
     Note
     -------
     - Atleast one of `lhs` and `rhs` needs to be af.Array.
-    - If `lhs` and `rhs` are both af.Array, they must be of same size.
+    - If `lhs` and `rhs` are both af.Array, they are broadcast to a common size.
     """
     return _arith_binary_func(lhs, rhs, backend.get().af_hypot)
 
@@ -486,7 +511,7 @@ def atan2(lhs, rhs):
     Note
     -------
     - Atleast one of `lhs` and `rhs` needs to be af.Array.
-    - If `lhs` and `rhs` are both af.Array, they must be of same size.
+    - If `lhs` and `rhs` are both af.Array, they are broadcast to a common size.
     """
     return _arith_binary_func(lhs, rhs, backend.get().af_atan2)
 
@@ -512,7 +537,7 @@ def cplx(lhs, rhs=None):
     Note
     -------
     - Atleast one of `lhs` and `rhs` needs to be af.Array.
-    - If `lhs` and `rhs` are both af.Array, they must be of same size.
+    - If `lhs` and `rhs` are both af.Array, they are broadcast to a common size.
     """
     if rhs is None:
         return _arith_unary_func(lhs, backend.get().af_cplx)
@@ -708,7 +733,7 @@ def root(lhs, rhs):
     Note
     -------
     - Atleast one of `lhs` and `rhs` needs to be af.Array.
-    - If `lhs` and `rhs` are both af.Array, they must be of same size.
+    - If `lhs` and `rhs` are both af.Array, they are broadcast to a common size.
     """
     return _arith_binary_func(lhs, rhs, backend.get().af_root)
 
@@ -732,7 +757,7 @@ def pow(lhs, rhs):
     Note
     -------
     - Atleast one of `lhs` and `rhs` needs to be af.Array.
-    - If `lhs` and `rhs` are both af.Array, they must be of same size.
+    - If `lhs` and `rhs` are both af.Array, they are broadcast to a common size.
     """
     return _arith_binary_func(lhs, rhs, backend.get().af_pow)
 
@@ -11,8 +11,8 @@
 Array class and helper functions.
 """
 
-import inspect
 import os
+import threading as _threading
 from .library import *
 from .util import *
 from .util import _is_number
@@ -23,6 +23,15 @@ from .index import _Index4
 
 _is_running_in_py_charm = "PYCHARM_HOSTED" in os.environ
 
+class _trace_state(_threading.local):
+    """
+    Tracer recording the operations of the current thread. For internal use only.
+    See arrayfire.trace.
+    """
+    tracer = None
+
+_trace_var = _trace_state()
+
 _display_dims_limit = None
 
 def set_display_dims_limit(*dims):
@@ -157,22 +166,55 @@ def constant_array(val, d0, d1=None, d2=None, d3=None, dtype=Dtype.f32):
         c_val = c_double_t(val)
         safe_call(backend.get().af_constant(c_pointer(out), c_val, 4, c_pointer(dims), dtype))
 
+    if _trace_var.tracer is not None:
+        _trace_var.tracer.constant(out, val, (d0, d1, d2, d3))
+
     return out
 
 
+def _bcast_flag(lhs, rhs):
+    """
+    Batch flag to be passed to a binary function of two arrays.
+
+    Dimensions of size 1 are broadcast as in numpy. Missing dimensions are 1,
+    so the shapes are aligned from the first dimension (column major).
+    If the shapes are not compatible, the flag is left unset and arrayfire
+    reports the size mismatch.
+    """
+    if _bcast_var.get():
+        return True
+
+    ldims = lhs._dims4()
+    rdims = rhs._dims4()
+
+    if ldims == rdims:
+        return False
+
+    for l, r in zip(ldims, rdims):
+        if l != r and l != 1 and r != 1:
+            return False
+
+    return True
+
 def _binary_func(lhs, rhs, c_func):
     out = Array()
     other = rhs
 
     if (_is_number(rhs)):
-        ldims = dim4_to_tuple(lhs.dims())
+        ldims = lhs._dims4()
         rty = implicit_dtype(rhs, lhs.type())
         other = Array()
         other.arr = constant_array(rhs, ldims[0], ldims[1], ldims[2], ldims[3], rty.value)
-    elif not isinstance(rhs, Array):
+        bcast = _bcast_var.get()
+    elif isinstance(rhs, Array):
+        bcast = _bcast_flag(lhs, rhs)
+    else:
         raise TypeError("Invalid parameter to binary function")
 
-    safe_call(c_func(c_pointer(out.arr), lhs.arr, other.arr, _bcast_var.get()))
+    safe_call(c_func(c_pointer(out.arr), lhs.arr, other.arr, bcast))
+
+    if _trace_var.tracer is not None:
+        _trace_var.tracer.record(c_func, out, (lhs, other), (bcast,))
 
     return out
 
@@ -181,14 +223,20 @@ def _binary_funcr(lhs, rhs, c_func):
     other = lhs
 
     if (_is_number(lhs)):
-        rdims = dim4_to_tuple(rhs.dims())
+        rdims = rhs._dims4()
         lty = implicit_dtype(lhs, rhs.type())
         other = Array()
         other.arr = constant_array(lhs, rdims[0], rdims[1], rdims[2], rdims[3], lty.value)
-    elif not isinstance(lhs, Array):
+        bcast = _bcast_var.get()
+    elif isinstance(lhs, Array):
+        bcast = _bcast_flag(lhs, rhs)
+    else:
         raise TypeError("Invalid parameter to binary function")
 
-    c_func(c_pointer(out.arr), other.arr, rhs.arr, _bcast_var.get())
+    safe_call(c_func(c_pointer(out.arr), other.arr, rhs.arr, bcast))
+
+    if _trace_var.tracer is not None:
+        _trace_var.tracer.record(c_func, out, (other, rhs), (bcast,))
 
     return out
 
@@ -443,6 +491,9 @@ class Array(BaseArray):
     # arrayfire's __radd__() instead of numpy's __add__()
     __array_priority__ = 30
 
+    # (handle, dims) of the last call to _dims4()
+    _dims4_cache = None
+
     def __init__(self, src=None, dims=None, dtype=None, is_device=False, offset=None, strides=None):
 
         super(Array, self).__init__()
@@ -683,6 +734,26 @@ class Array(BaseArray):
         dims = (d0.value,d1.value,d2.value,d3.value)
         return dims[:self.numdims()]
 
+    def _dims4(self):
+        """
+        Return all four dimensions of the array as a tuple.
+
+        The dimensions of an array handle never change, so the result is cached
+        until `self.arr` points to a different array.
+        """
+        cache = self._dims4_cache
+        if cache is not None and cache[0] == self.arr.value:
+            return cache[1]
+        d0 = c_dim_t(0)
+        d1 = c_dim_t(0)
+        d2 = c_dim_t(0)
+        d3 = c_dim_t(0)
+        safe_call(backend.get().af_get_dims(c_pointer(d0), c_pointer(d1),
+                                   c_pointer(d2), c_pointer(d3), self.arr))
+        dims = (d0.value,d1.value,d2.value,d3.value)
+        self._dims4_cache = (self.arr.value, dims)
+        return dims
+
     @property
     def shape(self):
         """
@@ -1280,9 +1351,12 @@ class Array(BaseArray):
         if (self.arr.value == 0):
             raise RuntimeError("Can not call to_ctype on empty array")
 
-        ctype_type = to_c_type[self.type()]
+        ty = self.type()
+        ctype_type = to_c_type[ty]
         res = ctype_type()
         safe_call(backend.get().af_get_scalar(c_pointer(res), self.arr))
+        if (ty == Dtype.c32.value or ty == Dtype.c64.value):
+            return complex(res[0], res[1])
         return res.value
 
     def __str__(self):
@@ -1369,6 +1443,87 @@ class Array(BaseArray):
         safe_call(backend.get().af_get_data_ptr(c_void_ptr_t(output.ctypes.data), tmp.arr))
         return output
 
+class DeviceScalar(Array):
+
+    """
+    A single value that stays in device memory.
+
+    Returned by the reductions (sum, min, max, count, dot, etc.) when called with `lazy=True`.
+
+    - Arithmetic with an af.Array broadcasts the value and returns an af.Array.
+    - Arithmetic with another DeviceScalar or a python number returns a DeviceScalar.
+    - The value is copied to the host only when converted using
+      float(), int(), complex(), bool() or format().
+
+    Examples
+    --------
+
+    >>> import arrayfire as af
+    >>> r = af.randu(100)
+    >>> rr = af.dot(r, r, return_scalar=True, lazy=True)
+    >>> r = r / rr       # no host synchronization
+    >>> print(float(rr)) # blocks until the value is available
+    """
+
+    def value(self):
+        """
+        Copy the value to the host and return it as a python number.
+        """
+        res = self.scalar()
+        if (self.type() == Dtype.b8.value):
+            return ord(res) != 0
+        return res
+
+    def __float__(self):
+        return float(self.value())
+
+    def __int__(self):
+        return int(self.value())
+
+    def __complex__(self):
+        return complex(self.value())
+
+    def __bool__(self):
+        return bool(self.value())
+
+    def __nonzero__(self):
+        return self.__bool__()
+
+    def __format__(self, format_spec):
+        return format(self.value(), format_spec)
+
+def _to_device_scalar(out):
+    res = DeviceScalar()
+    res.arr = out.arr
+    out.arr = c_void_ptr_t(0)
+    return res
+
+def _device_scalar_op(name):
+    func = getattr(Array, name)
+
+    def wrapper(self, *args):
+        out = func(self, *args)
+        if isinstance(out, DeviceScalar) or not isinstance(out, Array):
+            return out
+        for arg in args:
+            if not (isinstance(arg, DeviceScalar) or _is_number(arg)):
+                return out
+        return _to_device_scalar(out)
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = func.__doc__
+    return wrapper
+
+# Operators between DeviceScalars and numbers produce DeviceScalars
+for _name in ('__add__', '__iadd__', '__radd__', '__sub__', '__isub__', '__rsub__',
+              '__mul__', '__imul__', '__rmul__', '__truediv__', '__itruediv__', '__rtruediv__',
+              '__div__', '__idiv__', '__rdiv__', '__mod__', '__imod__', '__rmod__',
+              '__pow__', '__ipow__', '__rpow__', '__lt__', '__gt__', '__le__', '__ge__',
+              '__eq__', '__ne__'):
+    setattr(DeviceScalar, _name, _device_scalar_op(_name))
+
+del _name
+
 def display(a, precision=4):
     """
     Displays the contents of an array.
@@ -1380,6 +1535,7 @@ def display(a, precision=4):
     precision: int. optional.
         Specifies the number of precision bits to display
     """
+    import inspect
     expr = inspect.stack()[1][-2]
     name = ""
 
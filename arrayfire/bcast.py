@@ -9,21 +9,70 @@
 
 """
 Function to perform broadcasting operations.
+
+Binary operations broadcast arrays automatically: dimensions of size 1 are
+expanded to match the other input, as in numpy. The helpers in this module
+are kept for compatibility. Enabling the flag only skips the shape check.
 """
 
-class _bcast(object):
-    _flag = False
+from contextlib import contextmanager as _contextmanager
+import threading as _threading
+
+class _bcast(_threading.local):
+    """
+    Broadcast flag. For internal use only.
+
+    Every thread sees its own copy of the flag, so enabling broadcasting in
+    one thread does not change the behavior of arithmetic in other threads.
+    """
+    def __init__(self):
+        self._flag = False
+
     def get(self):
-        return _bcast._flag
+        return self._flag
 
     def set(self, flag):
-        _bcast._flag = flag
+        self._flag = flag
 
     def toggle(self):
-        _bcast._flag ^= True
+        self._flag ^= True
 
 _bcast_var = _bcast()
 
+@_contextmanager
+def broadcasting(flag=True):
+    """
+    Enable (or disable) broadcasting for the duration of a `with` block.
+
+    Parameters
+    ----------
+
+    flag : optional: bool. default: True.
+         Value of the broadcast flag inside the block.
+
+    Note
+    ----
+
+    - The flag is local to the calling thread.
+    - The previous value of the flag is restored when the block exits, even on exceptions.
+
+    Example
+    -------
+
+    >>> import arrayfire as af
+    >>> a = af.randu(2,3)
+    >>> b = af.randu(2,1)
+    >>> with af.broadcasting():
+    ...     c = a + b
+    ...
+    """
+    old = _bcast_var.get()
+    _bcast_var.set(flag)
+    try:
+        yield
+    finally:
+        _bcast_var.set(old)
+
 def broadcast(func, *args):
     """
     Function to perform broadcast operations.
@@ -42,8 +91,7 @@ def broadcast(func, *args):
     ...
     >>> a = af.randu(2,3)
     >>> b = af.randu(2,1) # b is a different size
-    >>> # Trying to add arrays of different sizes raises an exceptions
-    >>> c = add(a, b) # This call does not raise an exception because of the annotation
+    >>> c = add(a, b) # b is broadcast along the second dimension
     >>> af.display(a)
     [2 3 1 1]
         0.4107     0.9518     0.4198
@@ -65,8 +113,7 @@ def broadcast(func, *args):
     >>> add = lambda a,b: a + b
     >>> a = af.randu(2,3)
     >>> b = af.randu(2,1) # b is a different size
-    >>> # Trying to add arrays of different sizes raises an exceptions
-    >>> c = af.broadcast(add, a, b) # This call does not raise an exception
+    >>> c = af.broadcast(add, a, b) # b is broadcast along the second dimension
     >>> af.display(a)
     [2 3 1 1]
         0.4107     0.9518     0.4198
@@ -82,13 +129,16 @@ def broadcast(func, *args):
         1.1377     1.6787     1.1467
         1.5328     0.8898     0.7185
 
+    Note
+    ----
+
+    Broadcasting is only enabled in the thread calling `func`.
+
     """
 
     def wrapper(*func_args):
-        _bcast_var.toggle()
-        res = func(*func_args)
-        _bcast_var.toggle()
-        return res
+        with broadcasting(True):
+            return func(*func_args)
 
     if len(args) == 0:
         return wrapper
@@ -13,6 +13,9 @@ BLAS functions (matmul, dot, etc)
 
 from .library import *
 from .array import *
+from .algorithm import sum as _sum
+from .data import moddims as _moddims
+from .data import reorder as _reorder
 
 def matmul(lhs, rhs, lhs_opts=MATPROP.NONE, rhs_opts=MATPROP.NONE):
     """
@@ -150,7 +153,7 @@ def matmulTT(lhs, rhs):
                                       MATPROP.TRANS.value, MATPROP.TRANS.value))
     return out
 
-def dot(lhs, rhs, lhs_opts=MATPROP.NONE, rhs_opts=MATPROP.NONE, return_scalar = False):
+def dot(lhs, rhs, lhs_opts=MATPROP.NONE, rhs_opts=MATPROP.NONE, return_scalar = False, lazy = False):
     """
     Dot product of two input vectors.
 
@@ -176,10 +179,14 @@ def dot(lhs, rhs, lhs_opts=MATPROP.NONE, rhs_opts=MATPROP.NONE, return_scalar =
     return_scalar: optional: bool. default: False.
                - When set to true, the input arrays are flattened and the output is a scalar
 
+    lazy: optional: bool. default: False.
+               - Only used when `return_scalar` is True.
+               - When set to true, the output is an af.DeviceScalar that stays on the device.
+
     Returns
     -------
 
-    out : af.Array or scalar
+    out : af.Array, af.DeviceScalar or scalar
           Output of dot product of `lhs` and `rhs`.
 
     Note
@@ -189,7 +196,16 @@ def dot(lhs, rhs, lhs_opts=MATPROP.NONE, rhs_opts=MATPROP.NONE, return_scalar =
     - Batches are not supported.
 
     """
-    if return_scalar:
+    if return_scalar and lazy:
+        lhs_flat = Array()
+        rhs_flat = Array()
+        safe_call(backend.get().af_flat(c_pointer(lhs_flat.arr), lhs.arr))
+        safe_call(backend.get().af_flat(c_pointer(rhs_flat.arr), rhs.arr))
+        out = DeviceScalar()
+        safe_call(backend.get().af_dot(c_pointer(out.arr), lhs_flat.arr, rhs_flat.arr,
+                                       lhs_opts.value, rhs_opts.value))
+        return out
+    elif return_scalar:
         real = c_double_t(0)
         imag = c_double_t(0)
         safe_call(backend.get().af_dot_all(c_pointer(real), c_pointer(imag),
@@ -202,3 +218,255 @@ def dot(lhs, rhs, lhs_opts=MATPROP.NONE, rhs_opts=MATPROP.NONE, return_scalar =
         safe_call(backend.get().af_dot(c_pointer(out.arr), lhs.arr, rhs.arr,
                                        lhs_opts.value, rhs_opts.value))
         return out
+
+def _chain_dims(mat, opts):
+    dims = mat._dims4()
+    return (dims[0], dims[1]) if opts == MATPROP.NONE else (dims[1], dims[0])
+
+def _chain_order(sizes):
+    """
+    Cheapest parenthesization of a matrix chain, where matrix i is sizes[i] x sizes[i + 1].
+    """
+    num = len(sizes) - 1
+    cost = [[0] * num for i in range(num)]
+    split = [[0] * num for i in range(num)]
+    for length in range(1, num):
+        for i in range(num - length):
+            j = i + length
+            cost[i][j] = None
+            for s in range(i, j):
+                c = cost[i][s] + cost[s + 1][j] + sizes[i] * sizes[s + 1] * sizes[j + 1]
+                if cost[i][j] is None or c < cost[i][j]:
+                    cost[i][j] = c
+                    split[i][j] = s
+    return split
+
+def multi_dot(arrays):
+    """
+    Matrix product of two or more matrices, in the order that needs the fewest operations.
+
+    Parameters
+    ----------
+
+    arrays : list of af.Array or (af.Array, af.MATPROP) tuples.
+          The matrices to be multiplied, from left to right.
+          - A tuple (A, af.MATPROP.TRANS) or (A, af.MATPROP.CTRANS) uses the
+            (hermitian) transpose of A, without creating it.
+          - A 1 dimensional array is a column vector.
+
+    Returns
+    -------
+
+    out : af.Array
+          The product of all the matrices.
+
+    Note
+    -----
+
+    The cheapest order is found by dynamic programming over the dimensions of the
+    matrices. For example, for A (1000 x 10), B (10 x 1000) and C (1000 x 1),
+    A * (B * C) is computed instead of (A * B) * C.
+
+    """
+    mats = []
+    for item in arrays:
+        if isinstance(item, tuple):
+            mats.append(item)
+        else:
+            mats.append((item, MATPROP.NONE))
+
+    if len(mats) < 2:
+        raise RuntimeError("multi_dot requires at least two matrices")
+
+    sizes = [_chain_dims(*mats[0])[0]]
+    for mat, opts in mats:
+        rows, cols = _chain_dims(mat, opts)
+        if rows != sizes[-1]:
+            raise RuntimeError("Dimension mismatch in multi_dot")
+        sizes.append(cols)
+
+    split = _chain_order(sizes)
+
+    def product(i, j):
+        if i == j:
+            return mats[i]
+        s = split[i][j]
+        lhs, lhs_opts = product(i, s)
+        rhs, rhs_opts = product(s + 1, j)
+        return matmul(lhs, rhs, lhs_opts, rhs_opts), MATPROP.NONE
+
+    return product(0, len(mats) - 1)[0]
+
+# Contraction plans of einsum, keyed by the subscripts and the shapes of the operands
+_einsum_plans = {}
+_EINSUM_CACHE_SIZE = 256
+
+def _prod(sizes):
+    res = 1
+    for size in sizes:
+        res *= size
+    return res
+
+def _full_perm(perm):
+    # reorder needs all 4 dimensions, the unused ones keep their order
+    return list(perm) + [d for d in range(4) if d not in perm]
+
+def _einsum_parse(subscripts, operands):
+    subscripts = subscripts.replace(' ', '')
+    if '->' in subscripts:
+        inputs, output = subscripts.split('->')
+    else:
+        inputs, output = subscripts, None
+    inputs = inputs.split(',')
+
+    if len(inputs) != len(operands):
+        raise RuntimeError("einsum: expected %d operands, got %d" % (len(inputs), len(operands)))
+
+    if output is None:
+        labels = ''.join(inputs)
+        output = ''.join(sorted(c for c in set(labels) if labels.count(c) == 1))
+
+    sizes = {}
+    for labels, arr in zip(inputs, operands):
+        dims = arr._dims4()
+        if len(labels) > 4 or len(set(labels)) != len(labels) or not labels.isalpha():
+            raise RuntimeError("einsum: invalid subscripts %r" % labels)
+        if _prod(dims[len(labels):]) != 1:
+            raise RuntimeError("einsum: operand has more dimensions than subscripts %r" % labels)
+        for c, size in zip(labels, dims):
+            if sizes.setdefault(c, size) != size:
+                raise RuntimeError("einsum: size mismatch for subscript %r" % c)
+
+    if len(output) > 4 or len(set(output)) != len(output) or any(c not in sizes for c in output):
+        raise RuntimeError("einsum: invalid output subscripts %r" % output)
+
+    return inputs, output, sizes
+
+def _einsum_plan(inputs, output, sizes):
+    """
+    Sequence of reductions and pairwise contractions computing the einsum.
+
+    Every step refers to positions in the list of terms that are still alive.
+    """
+    terms = list(inputs)
+    steps = []
+
+    def needed(skip):
+        res = set(output)
+        for k, labels in enumerate(terms):
+            if k not in skip:
+                res.update(labels)
+        return res
+
+    # Sum over the labels that appear in a single term only
+    for i, labels in enumerate(terms):
+        keep = needed((i,))
+        axes = [d for d, c in enumerate(labels) if c not in keep]
+        if axes:
+            terms[i] = ''.join(c for c in labels if c in keep)
+            steps.append(('sum', i, axes, [sizes[c] for c in terms[i]]))
+
+    while len(terms) > 1:
+        # Contract the pair with the smallest result first
+        best = None
+        for i in range(len(terms)):
+            for j in range(i + 1, len(terms)):
+                keep = needed((i, j))
+                labels = set(terms[i]) | set(terms[j])
+                size = _prod(sizes[c] for c in labels if c in keep)
+                if best is None or size < best[0]:
+                    best = (size, i, j, keep)
+
+        _, i, j, keep = best
+        lhs, rhs = terms[i], terms[j]
+        batch = [c for c in lhs if c in rhs and c in keep]
+        inner = [c for c in lhs if c in rhs and c not in keep]
+        left = [c for c in lhs if c not in rhs]
+        right = [c for c in rhs if c not in lhs]
+        result = ''.join(left + right + batch)
+        if len(result) > 4:
+            raise RuntimeError("einsum: intermediate result has more than 4 dimensions")
+
+        lhs_perm = _full_perm([lhs.index(c) for c in left + inner + batch])
+        rhs_perm = _full_perm([rhs.index(c) for c in inner + right + batch])
+        lhs_shape = [_prod(sizes[c] for c in left), _prod(sizes[c] for c in inner), _prod(sizes[c] for c in batch)]
+        rhs_shape = [lhs_shape[1], _prod(sizes[c] for c in right), lhs_shape[2]]
+        steps.append(('matmul', i, j, lhs_perm, lhs_shape, rhs_perm, rhs_shape, [sizes[c] for c in result]))
+
+        terms[i] = result
+        del terms[j]
+
+    perm = _full_perm([terms[0].index(c) for c in output])
+    steps.append(('reorder', perm))
+    return steps
+
+def _einsum_run(steps, operands):
+    terms = list(operands)
+    for step in steps:
+        kind = step[0]
+        if kind == 'sum':
+            _, i, axes, shape = step
+            res = terms[i]
+            for d in axes:
+                res = _sum(res, d)
+            terms[i] = _moddims(res, *(shape or [1]))
+        elif kind == 'matmul':
+            _, i, j, lhs_perm, lhs_shape, rhs_perm, rhs_shape, shape = step
+            lhs = _moddims(_reorder(terms[i], *lhs_perm), *lhs_shape)
+            rhs = _moddims(_reorder(terms[j], *rhs_perm), *rhs_shape)
+            terms[i] = _moddims(matmul(lhs, rhs), *(shape or [1]))
+            del terms[j]
+        else:
+            perm = step[1]
+            if perm != [0, 1, 2, 3]:
+                terms[0] = _reorder(terms[0], *perm)
+    return terms[0]
+
+def einsum(subscripts, *operands):
+    """
+    Evaluate a tensor contraction written in Einstein summation notation.
+
+    Parameters
+    ----------
+
+    subscripts : str
+          The subscripts of every operand, separated by commas, optionally followed
+          by '->' and the subscripts of the output. Letters refer to the dimensions in
+          arrayfire order, so 'ij' is an array of size i x j with dimension 0 of size i.
+          Without '->', the output has the letters that appear once, in alphabetical order.
+
+    *operands : af.Array
+          Arrays with up to 4 dimensions.
+
+    Returns
+    -------
+
+    out : af.Array
+          The result of the contraction.
+
+    Note
+    -----
+
+    - The pairs of operands are contracted in the order that gives the smallest
+      intermediate results. Every contraction is done with reorder, moddims and a
+      (batched) matmul.
+    - The plan is cached for each combination of subscripts and operand sizes.
+    - Repeated letters within one operand (traces and diagonals) are not supported.
+
+    Examples
+    --------
+
+    >>> import arrayfire as af
+    >>> c = af.einsum('ij,jk->ik', a, b)        # matmul(a, b)
+    >>> c = af.einsum('ijb,jkb->ikb', a, b)     # batched matmul
+    >>> c = af.einsum('ij,ij->i', a, b)         # sum(a * b, 1)
+
+    """
+    key = (subscripts, tuple(arr._dims4() for arr in operands))
+    steps = _einsum_plans.get(key)
+    if steps is None:
+        steps = _einsum_plan(*_einsum_parse(subscripts, operands))
+        if len(_einsum_plans) >= _EINSUM_CACHE_SIZE:
+            _einsum_plans.clear()
+        _einsum_plans[key] = steps
+    return _einsum_run(steps, operands)
@@ -11,6 +11,7 @@ Functions to handle the available devices in the backend.
 """
 
 from .library import *
+from contextlib import contextmanager as _contextmanager
 from .util import (safe_call, to_str, get_version)
 
 def init():
@@ -79,9 +80,45 @@ def set_device(num):
     -----------
     num: int.
          id of the desired device.
+
+    Note
+    -----
+    The active device is tracked per host thread by the library.
+    Calling this function does not change the device used by other threads.
     """
     safe_call(backend.get().af_set_device(num))
 
+@_contextmanager
+def device_scope(num):
+    """
+    Use a specific device in the calling thread for the duration of a `with` block.
+
+    Parameters
+    -----------
+    num: int.
+         id of the desired device.
+
+    Note
+    -----
+    The previously active device of the calling thread is restored when the block exits.
+
+    Examples
+    --------
+
+    >>> import arrayfire as af
+    >>> with af.device_scope(1):
+    ...     a = af.randu(3, 3) # Created on device 1
+    ...
+    """
+    curr = get_device()
+    if (num != curr):
+        set_device(num)
+    try:
+        yield
+    finally:
+        if (num != curr):
+            set_device(curr)
+
 def info_str(verbose = False):
     """
     Returns information about the following as a string:
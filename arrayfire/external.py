@@ -0,0 +1,344 @@
+#######################################################
+# Copyright (c) 2015, ArrayFire
+# All rights reserved.
+#
+# This file is distributed under 3-clause BSD license.
+# The complete license agreement can be obtained at:
+# http://arrayfire.com/licenses/BSD-3-Clause
+########################################################
+
+"""
+Sorting and top k for data that does not fit in device memory.
+
+The data is processed one chunk at a time. Each chunk is sorted on the device,
+and the sorted runs are merged on the host.
+
+    >>> import numpy as np
+    >>> import arrayfire as af
+    >>> scores = np.memmap('scores.f32', dtype=np.float32, mode='r')
+    >>> values, indices = af.external.topk(scores, 100, chunk_size=2**26)
+    >>> out = np.memmap('sorted.f32', dtype=np.float32, mode='w+', shape=scores.shape)
+    >>> af.external.sort(scores, chunk_size=2**26, out=out)
+
+"""
+
+from .library import *
+from .array import *
+from .algorithm import sort as _sort
+from .algorithm import sort_index as _sort_index
+from .data import flat as _flat
+from .data import join as _join
+from .data import lookup as _lookup
+from .interop import to_array as _to_array
+from .interop import AF_NUMPY_FOUND as _AF_NUMPY_FOUND
+from .statistics import topk as _topk
+
+def _chunks(data, chunk_size):
+    """
+    Yield (offset, af.Array) for every chunk of `data`, flattened to 1D.
+
+    Multi dimensional numpy arrays are flattened in C order first, so that the
+    offsets are element offsets into `data.reshape(-1)`.
+    """
+    if hasattr(data, 'shape') and not isinstance(data, Array):
+        if chunk_size is None:
+            raise RuntimeError("chunk_size is required for numpy arrays")
+        if len(data.shape) > 1:
+            # A view for contiguous arrays and memory maps
+            data = data.reshape(-1)
+        num = data.shape[0]
+        for start in range(0, num, chunk_size):
+            yield start, _flat(_to_array(data[start:start + chunk_size]))
+        return
+
+    offset = 0
+    for chunk in data:
+        if not isinstance(chunk, Array):
+            chunk = _to_array(chunk)
+        chunk = _flat(chunk)
+        yield offset, chunk
+        offset += chunk.elements()
+
+def _check_numpy():
+    if not _AF_NUMPY_FOUND:
+        raise RuntimeError("numpy is required to merge the sorted runs")
+
+def _host_buffer(num, dtype, tmpdir):
+    import numpy as np
+    if tmpdir is None:
+        return np.empty(num, dtype=dtype)
+    import tempfile
+    return np.memmap(tempfile.TemporaryFile(dir=tmpdir), dtype=dtype, mode='w+', shape=(max(num, 1),))[:num]
+
+def _to_host(arr, tmpdir):
+    buf = _host_buffer(arr.elements(), to_typecode[arr.type()], tmpdir)
+    if arr.elements() > 0:
+        arr.to_ndarray(buf)
+    return buf
+
+def _sorted_runs(keys, vals, chunk_size, is_ascending, with_index, tmpdir):
+    """
+    Sort every chunk on the device and copy the sorted runs to the host.
+    """
+    import numpy as np
+    runs = []
+    val_chunks = None if vals is None else _chunks(vals, chunk_size)
+    for offset, chunk in _chunks(keys, chunk_size):
+        if vals is None and not with_index:
+            runs.append((_to_host(_sort(chunk, is_ascending=is_ascending), tmpdir), None))
+            continue
+
+        sorted_keys, idx = _sort_index(chunk, is_ascending=is_ascending)
+        if with_index:
+            run_vals = _host_buffer(idx.elements(), np.int64, tmpdir)
+            np.add(_to_host(idx, tmpdir), offset, out=run_vals, casting='unsafe')
+        else:
+            val_offset, val_chunk = next(val_chunks)
+            if val_offset != offset or val_chunk.elements() != chunk.elements():
+                raise RuntimeError("The chunks of keys and values do not match")
+            run_vals = _to_host(_lookup(val_chunk, idx), tmpdir)
+        runs.append((_to_host(sorted_keys, tmpdir), run_vals))
+    return runs
+
+def _merge(runs, is_ascending, block_size, out_keys, out_vals):
+    """
+    Merge the sorted runs, `block_size` elements of every run at a time.
+
+    Only the elements that are known to precede everything not yet loaded are
+    written out in each step, so the memory used is bounded by the number of
+    runs times `block_size`.
+    """
+    import numpy as np
+    pos = [0] * len(runs)
+    active = [i for i in range(len(runs)) if len(runs[i][0]) > 0]
+    written = 0
+
+    while active:
+        heads = [runs[i][0][pos[i]:pos[i] + block_size] for i in active]
+
+        # The last loaded element of every run with more data bounds what can be written
+        bounds = [head[-1] for i, head in zip(active, heads) if pos[i] + len(head) < len(runs[i][0])]
+        if bounds:
+            cutoff = min(bounds) if is_ascending else max(bounds)
+
+        key_parts = []
+        val_parts = []
+        for i, head in zip(active, heads):
+            if not bounds:
+                count = len(head)
+            elif is_ascending:
+                count = np.searchsorted(head, cutoff, side='right')
+            else:
+                count = len(head) - np.searchsorted(head[::-1], cutoff, side='left')
+            key_parts.append(head[:count])
+            if out_vals is not None:
+                val_parts.append(runs[i][1][pos[i]:pos[i] + count])
+            pos[i] += count
+
+        batch = np.concatenate(key_parts)
+        order = np.argsort(batch, kind='stable')
+        if not is_ascending:
+            order = order[::-1]
+
+        num = len(batch)
+        out_keys[written:written + num] = batch[order]
+        if out_vals is not None:
+            out_vals[written:written + num] = np.concatenate(val_parts)[order]
+        written += num
+
+        active = [i for i in active if pos[i] < len(runs[i][0])]
+
+def _sort_external(keys, vals, chunk_size, is_ascending, with_index, out, out_vals, block_size, tmpdir):
+    _check_numpy()
+    import numpy as np
+    runs = _sorted_runs(keys, vals, chunk_size, is_ascending, with_index, tmpdir)
+
+    num = sum(len(run[0]) for run in runs)
+    key_type = runs[0][0].dtype if runs else np.float32
+    if out is None:
+        out = np.empty(num, dtype=key_type)
+    if out_vals is None and (vals is not None or with_index):
+        val_type = runs[0][1].dtype if runs else np.int64
+        out_vals = np.empty(num, dtype=val_type)
+    if len(out) != num or (out_vals is not None and len(out_vals) != num):
+        raise RuntimeError("Output size does not match that of input")
+
+    if block_size is None:
+        block_size = max(chunk_size or 0, max([len(run[0]) for run in runs] or [1])) // max(len(runs), 1)
+    _merge(runs, is_ascending, max(block_size, 1), out, out_vals)
+    return out, out_vals
+
+def sort(data, chunk_size=None, is_ascending=True, out=None, block_size=None, tmpdir=None):
+    """
+    Sort data that does not fit in device memory.
+
+    Parameters
+    ----------
+    data : numpy.ndarray / numpy.memmap or an iterable of chunks.
+         - If a numpy array, it is processed `chunk_size` elements at a time.
+           Multi dimensional arrays are flattened in C order.
+         - Otherwise, every item is an af.Array or an array like object accepted by af.to_array.
+         The data is treated as a 1D array.
+
+    chunk_size : optional: int. default: None.
+         Number of elements sorted on the device at once. Required if `data` is a numpy array.
+
+    is_ascending : optional: bool. default: True.
+         Specifies the direction of the sort.
+
+    out : optional: numpy.ndarray / numpy.memmap. default: None.
+         1D array to store the result in.
+
+    block_size : optional: int. default: None.
+         Number of elements of every sorted run loaded on the host in each merge step.
+         Defaults to the largest run divided by the number of runs.
+
+    tmpdir : optional: str. default: None.
+         If not None, the sorted runs are stored in memory mapped files in this
+         directory instead of host memory.
+
+    Returns
+    -------
+    out : numpy.ndarray
+        The sorted data.
+
+    Note
+    ----
+    Requires numpy.
+    """
+    return _sort_external(data, None, chunk_size, is_ascending, False, out, None, block_size, tmpdir)[0]
+
+def sort_index(data, chunk_size=None, is_ascending=True, out=None, out_idx=None, block_size=None, tmpdir=None):
+    """
+    Sort data that does not fit in device memory and return the original indices.
+
+    Parameters
+    ----------
+    data : numpy.ndarray / numpy.memmap or an iterable of chunks.
+         See `sort`.
+
+    chunk_size : optional: int. default: None.
+         Number of elements sorted on the device at once. Required if `data` is a numpy array.
+
+    is_ascending : optional: bool. default: True.
+         Specifies the direction of the sort.
+
+    out : optional: numpy.ndarray / numpy.memmap. default: None.
+         1D array to store the sorted data in.
+
+    out_idx : optional: numpy.ndarray / numpy.memmap. default: None.
+         1D array to store the indices in.
+
+    block_size : optional: int. default: None.
+         See `sort`.
+
+    tmpdir : optional: str. default: None.
+         See `sort`.
+
+    Returns
+    -------
+    (out, out_idx): tuple of numpy.ndarray
+         - `out` contains the sorted data.
+         - `out_idx` contains the int64 positions of the sorted elements in `data`
+           (in `data.reshape(-1)` for multi dimensional numpy arrays).
+
+    Note
+    ----
+    - Requires numpy.
+    - The relative order of equal elements from different chunks is not preserved.
+    """
+    return _sort_external(data, None, chunk_size, is_ascending, True, out, out_idx, block_size, tmpdir)
+
+def sort_by_key(keys, vals, chunk_size=None, is_ascending=True, out_keys=None, out_vals=None,
+                block_size=None, tmpdir=None):
+    """
+    Sort values by keys that do not fit in device memory.
+
+    Parameters
+    ----------
+    keys : numpy.ndarray / numpy.memmap or an iterable of chunks.
+         See `sort`.
+
+    vals : numpy.ndarray / numpy.memmap or an iterable of chunks.
+         Must be chunked the same way as `keys`.
+
+    chunk_size : optional: int. default: None.
+         Number of elements sorted on the device at once. Required if `keys` is a numpy array.
+
+    is_ascending : optional: bool. default: True.
+         Specifies the direction of the sort.
+
+    out_keys : optional: numpy.ndarray / numpy.memmap. default: None.
+         1D array to store the sorted keys in.
+
+    out_vals : optional: numpy.ndarray / numpy.memmap. default: None.
+         1D array to store the values in.
+
+    block_size : optional: int. default: None.
+         See `sort`.
+
+    tmpdir : optional: str. default: None.
+         See `sort`.
+
+    Returns
+    -------
+    (out_keys, out_vals): tuple of numpy.ndarray
+         - `out_keys` contains the sorted keys.
+         - `out_vals` contains the values sorted by the keys.
+
+    Note
+    ----
+    - Requires numpy.
+    - The relative order of equal keys from different chunks is not preserved.
+    """
+    return _sort_external(keys, vals, chunk_size, is_ascending, False, out_keys, out_vals, block_size, tmpdir)
+
+def topk(data, k, chunk_size=None, order=TOPK.DEFAULT):
+    """
+    Return the top k elements of data that does not fit in device memory.
+
+    The k best candidates seen so far are kept on the device and combined with
+    the top k elements of every new chunk.
+
+    Parameters
+    ----------
+    data : numpy.ndarray / numpy.memmap or an iterable of chunks.
+         See `sort`.
+
+    k : int.
+         The number of elements to return.
+
+    chunk_size : optional: int. default: None.
+         Number of elements processed on the device at once. Required if `data` is a numpy array.
+
+    order : optional: af.TOPK. default: af.TOPK.DEFAULT
+         The ordering of k extracted elements. Defaults to top k max values.
+
+    Returns
+    -------
+    values : af.Array
+        Top k elements of `data`.
+    indices : af.Array
+        The positions of the top k elements in `data`, as s64
+        (in `data.reshape(-1)` for multi dimensional numpy arrays).
+    """
+    values = None
+    indices = None
+    for offset, chunk in _chunks(data, chunk_size):
+        if chunk.elements() == 0:
+            continue
+
+        vals, idx = _topk(chunk, min(k, chunk.elements()), order=order)
+        idx = idx.as_type(Dtype.s64) + offset
+
+        if values is not None:
+            vals = _join(0, values, vals)
+            idx = _join(0, indices, idx)
+            vals, pos = _topk(vals, min(k, vals.elements()), order=order)
+            idx = _lookup(idx, pos)
+
+        values, indices = vals, idx
+
+    if values is None:
+        raise RuntimeError("No data was provided")
+    return values, indices
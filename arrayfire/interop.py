@@ -17,6 +17,9 @@ This module provides helper functions to copy data to arrayfire from the followi
      3. pyopencl - pyopencl.array
      4. numba - numba.cuda.cudadrv.devicearray.DeviceNDArray
 
+None of these packages are imported by this module. The converters are looked up
+by the type name of the input, so a package is only used once one of its arrays is passed in.
+
 """
 
 from .array import *
@@ -60,203 +63,198 @@ _nptype_to_aftype = {'b1' : Dtype.b8,
                      'f8' : Dtype.f64,
                      'c16' : Dtype.c64}
 
-try:
-    import numpy as np
-except ImportError:
-    AF_NUMPY_FOUND=False
-else:
-    from numpy import ndarray as NumpyArray
-    from .data import reorder
-
-    AF_NUMPY_FOUND=True
-
-    def np_to_af_array(np_arr, copy=True):
-        """
-        Convert numpy.ndarray to arrayfire.Array.
-
-        Parameters
-        ----------
-        np_arr  : numpy.ndarray()
-
-        copy : Bool specifying if array is to be copied.
-               Default is true.
-               Can only be False if array is fortran contiguous.
-
-        Returns
-        ---------
-        af_arr  : arrayfire.Array()
-        """
-
-        in_shape = np_arr.shape
-        in_ptr = np_arr.ctypes.data_as(c_void_ptr_t)
-        in_dtype = _nptype_to_aftype[np_arr.dtype.str[1:]]
-
-        if not copy:
-            raise RuntimeError("Copy can not be False for numpy arrays")
-
-        if (np_arr.flags['F_CONTIGUOUS']):
-            return _fc_to_af_array(in_ptr, in_shape, in_dtype)
-        elif (np_arr.flags['C_CONTIGUOUS']):
-            return _cc_to_af_array(in_ptr, np_arr.ndim, in_shape, in_dtype)
-        else:
-            return np_to_af_array(np_arr.copy())
-
-    from_ndarray = np_to_af_array
-
-try:
-    import pycuda.gpuarray
-except ImportError:
-    AF_PYCUDA_FOUND=False
-else:
-    from pycuda.gpuarray import GPUArray as CudaArray
-    AF_PYCUDA_FOUND=True
-
-    def pycuda_to_af_array(pycu_arr, copy=True):
-        """
-        Convert pycuda.gpuarray to arrayfire.Array
-
-        Parameters
-        -----------
-        pycu_arr  : pycuda.GPUArray()
-
-        copy : Bool specifying if array is to be copied.
-               Default is true.
-               Can only be False if array is fortran contiguous.
-
-        Returns
-        ----------
-        af_arr    : arrayfire.Array()
-
-        Note
-        ----------
-        The input array is copied to af.Array
-        """
-
-        in_ptr = pycu_arr.ptr
-        in_shape = pycu_arr.shape
-        in_dtype = pycu_arr.dtype.char
-
-        if not copy and not pycu_arr.flags.f_contiguous:
-            raise RuntimeError("Copy can only be False when arr.flags.f_contiguous is True")
-
-        if (pycu_arr.flags.f_contiguous):
-            return _fc_to_af_array(in_ptr, in_shape, in_dtype, True, copy)
-        elif (pycu_arr.flags.c_contiguous):
-            return _cc_to_af_array(in_ptr, pycu_arr.ndim, in_shape, in_dtype, True, copy)
-        else:
-            return pycuda_to_af_array(pycu_arr.copy())
-
-try:
-    from pyopencl.array import Array as OpenclArray
-except ImportError:
-    AF_PYOPENCL_FOUND=False
-else:
+def _module_found(name):
+    """
+    Check if a module can be imported without importing it.
+    """
+    try:
+        from importlib.util import find_spec
+    except ImportError:
+        import imp
+        try:
+            imp.find_module(name)
+            return True
+        except ImportError:
+            return False
+    try:
+        return find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+AF_NUMPY_FOUND=_module_found('numpy')
+AF_PYCUDA_FOUND=_module_found('pycuda')
+AF_PYOPENCL_FOUND=_module_found('pyopencl')
+AF_NUMBA_FOUND=_module_found('numba')
+
+def np_to_af_array(np_arr, copy=True):
+    """
+    Convert numpy.ndarray to arrayfire.Array.
+
+    Parameters
+    ----------
+    np_arr  : numpy.ndarray()
+
+    copy : Bool specifying if array is to be copied.
+           Default is true.
+           Can only be False if array is fortran contiguous.
+
+    Returns
+    ---------
+    af_arr  : arrayfire.Array()
+    """
+
+    in_shape = np_arr.shape
+    in_ptr = np_arr.ctypes.data_as(c_void_ptr_t)
+    in_dtype = _nptype_to_aftype[np_arr.dtype.str[1:]]
+
+    if not copy:
+        raise RuntimeError("Copy can not be False for numpy arrays")
+
+    if (np_arr.flags['F_CONTIGUOUS']):
+        return _fc_to_af_array(in_ptr, in_shape, in_dtype)
+    elif (np_arr.flags['C_CONTIGUOUS']):
+        return _cc_to_af_array(in_ptr, np_arr.ndim, in_shape, in_dtype)
+    else:
+        return np_to_af_array(np_arr.copy())
+
+from_ndarray = np_to_af_array
+
+def pycuda_to_af_array(pycu_arr, copy=True):
+    """
+    Convert pycuda.gpuarray to arrayfire.Array
+
+    Parameters
+    -----------
+    pycu_arr  : pycuda.GPUArray()
+
+    copy : Bool specifying if array is to be copied.
+           Default is true.
+           Can only be False if array is fortran contiguous.
+
+    Returns
+    ----------
+    af_arr    : arrayfire.Array()
+
+    Note
+    ----------
+    The input array is copied to af.Array
+    """
+
+    in_ptr = pycu_arr.ptr
+    in_shape = pycu_arr.shape
+    in_dtype = pycu_arr.dtype.char
+
+    if not copy and not pycu_arr.flags.f_contiguous:
+        raise RuntimeError("Copy can only be False when arr.flags.f_contiguous is True")
+
+    if (pycu_arr.flags.f_contiguous):
+        return _fc_to_af_array(in_ptr, in_shape, in_dtype, True, copy)
+    elif (pycu_arr.flags.c_contiguous):
+        return _cc_to_af_array(in_ptr, pycu_arr.ndim, in_shape, in_dtype, True, copy)
+    else:
+        return pycuda_to_af_array(pycu_arr.copy())
+
+def pyopencl_to_af_array(pycl_arr, copy=True):
+    """
+    Convert pyopencl.gpuarray to arrayfire.Array
+
+    Parameters
+    -----------
+    pycl_arr  : pyopencl.Array()
+
+    copy : Bool specifying if array is to be copied.
+           Default is true.
+           Can only be False if array is fortran contiguous.
+
+    Returns
+    ----------
+    af_arr    : arrayfire.Array()
+
+    Note
+    ----------
+    The input array is copied to af.Array
+    """
+
     from .opencl import add_device_context as _add_device_context
     from .opencl import set_device_context as _set_device_context
     from .opencl import get_device_id as _get_device_id
     from .opencl import get_context as _get_context
-    AF_PYOPENCL_FOUND=True
-
-    def pyopencl_to_af_array(pycl_arr, copy=True):
-        """
-        Convert pyopencl.gpuarray to arrayfire.Array
-
-        Parameters
-        -----------
-        pycl_arr  : pyopencl.Array()
-
-        copy : Bool specifying if array is to be copied.
-               Default is true.
-               Can only be False if array is fortran contiguous.
-
-        Returns
-        ----------
-        af_arr    : arrayfire.Array()
-
-        Note
-        ----------
-        The input array is copied to af.Array
-        """
-
-        ctx = pycl_arr.context.int_ptr
-        que = pycl_arr.queue.int_ptr
-        dev = pycl_arr.queue.device.int_ptr
-
-        dev_idx = None
-        ctx_idx = None
-        for n in range(get_device_count()):
-            set_device(n)
-            dev_idx = _get_device_id()
-            ctx_idx = _get_context()
-            if (dev_idx == dev and ctx_idx == ctx):
-                break
-
-        if (dev_idx == None or ctx_idx == None or
-            dev_idx != dev or ctx_idx != ctx):
-            print("Adding context and queue")
-            _add_device_context(dev, ctx, que)
-            _set_device_context(dev, ctx)
-
-        info()
-        in_ptr = pycl_arr.base_data.int_ptr
-        in_shape = pycl_arr.shape
-        in_dtype = pycl_arr.dtype.char
-
-        if not copy and not pycl_arr.flags.f_contiguous:
-            raise RuntimeError("Copy can only be False when arr.flags.f_contiguous is True")
-
-        print("Copying array")
-        print(pycl_arr.base_data.int_ptr)
-        if (pycl_arr.flags.f_contiguous):
-            return _fc_to_af_array(in_ptr, in_shape, in_dtype, True, copy)
-        elif (pycl_arr.flags.c_contiguous):
-            return _cc_to_af_array(in_ptr, pycl_arr.ndim, in_shape, in_dtype, True, copy)
-        else:
-            return pyopencl_to_af_array(pycl_arr.copy())
-
-try:
-    import numba
-except ImportError:
-    AF_NUMBA_FOUND=False
-else:
-    from numba import cuda
-    NumbaCudaArray = cuda.cudadrv.devicearray.DeviceNDArray
-    AF_NUMBA_FOUND=True
-
-    def numba_to_af_array(nb_arr, copy=True):
-        """
-        Convert numba.gpuarray to arrayfire.Array
-
-        Parameters
-        -----------
-        nb_arr  : numba.cuda.cudadrv.devicearray.DeviceNDArray()
-
-        copy : Bool specifying if array is to be copied.
-               Default is true.
-               Can only be False if array is fortran contiguous.
-
-        Returns
-        ----------
-        af_arr    : arrayfire.Array()
-
-        Note
-        ----------
-        The input array is copied to af.Array
-        """
-
-        in_ptr = nb_arr.device_ctypes_pointer.value
-        in_shape = nb_arr.shape
-        in_dtype = _nptype_to_aftype[nb_arr.dtype.str[1:]]
-
-        if not copy and not nb_arr.flags.f_contiguous:
-            raise RuntimeError("Copy can only be False when arr.flags.f_contiguous is True")
-
-        if (nb_arr.is_f_contiguous()):
-            return _fc_to_af_array(in_ptr, in_shape, in_dtype, True, copy)
-        elif (nb_arr.is_c_contiguous()):
-            return _cc_to_af_array(in_ptr, nb_arr.ndim, in_shape, in_dtype, True, copy)
-        else:
-            return numba_to_af_array(nb_arr.copy())
+
+    ctx = pycl_arr.context.int_ptr
+    que = pycl_arr.queue.int_ptr
+    dev = pycl_arr.queue.device.int_ptr
+
+    dev_idx = None
+    ctx_idx = None
+    for n in range(get_device_count()):
+        set_device(n)
+        dev_idx = _get_device_id()
+        ctx_idx = _get_context()
+        if (dev_idx == dev and ctx_idx == ctx):
+            break
+
+    if (dev_idx == None or ctx_idx == None or
+        dev_idx != dev or ctx_idx != ctx):
+        print("Adding context and queue")
+        _add_device_context(dev, ctx, que)
+        _set_device_context(dev, ctx)
+
+    info()
+    in_ptr = pycl_arr.base_data.int_ptr
+    in_shape = pycl_arr.shape
+    in_dtype = pycl_arr.dtype.char
+
+    if not copy and not pycl_arr.flags.f_contiguous:
+        raise RuntimeError("Copy can only be False when arr.flags.f_contiguous is True")
+
+    print("Copying array")
+    print(pycl_arr.base_data.int_ptr)
+    if (pycl_arr.flags.f_contiguous):
+        return _fc_to_af_array(in_ptr, in_shape, in_dtype, True, copy)
+    elif (pycl_arr.flags.c_contiguous):
+        return _cc_to_af_array(in_ptr, pycl_arr.ndim, in_shape, in_dtype, True, copy)
+    else:
+        return pyopencl_to_af_array(pycl_arr.copy())
+
+def numba_to_af_array(nb_arr, copy=True):
+    """
+    Convert numba.gpuarray to arrayfire.Array
+
+    Parameters
+    -----------
+    nb_arr  : numba.cuda.cudadrv.devicearray.DeviceNDArray()
+
+    copy : Bool specifying if array is to be copied.
+           Default is true.
+           Can only be False if array is fortran contiguous.
+
+    Returns
+    ----------
+    af_arr    : arrayfire.Array()
+
+    Note
+    ----------
+    The input array is copied to af.Array
+    """
+
+    in_ptr = nb_arr.device_ctypes_pointer.value
+    in_shape = nb_arr.shape
+    in_dtype = _nptype_to_aftype[nb_arr.dtype.str[1:]]
+
+    if not copy and not nb_arr.flags.f_contiguous:
+        raise RuntimeError("Copy can only be False when arr.flags.f_contiguous is True")
+
+    if (nb_arr.is_f_contiguous()):
+        return _fc_to_af_array(in_ptr, in_shape, in_dtype, True, copy)
+    elif (nb_arr.is_c_contiguous()):
+        return _cc_to_af_array(in_ptr, nb_arr.ndim, in_shape, in_dtype, True, copy)
+    else:
+        return numba_to_af_array(nb_arr.copy())
+
+_converters = {'numpy.ndarray' : np_to_af_array,
+               'pycuda.gpuarray.GPUArray' : pycuda_to_af_array,
+               'pyopencl.array.Array' : pyopencl_to_af_array,
+               'numba.cuda.cudadrv.devicearray.DeviceNDArray' : numba_to_af_array}
 
 def to_array(in_array, copy = True):
     """
@@ -282,12 +280,10 @@ def to_array(in_array, copy = True):
     af.Array of same dimensions as input after copying the data from the input
 
     """
-    if AF_NUMPY_FOUND and isinstance(in_array, NumpyArray):
-        return np_to_af_array(in_array, copy)
-    if AF_PYCUDA_FOUND and isinstance(in_array, CudaArray):
-        return pycuda_to_af_array(in_array, copy)
-    if AF_PYOPENCL_FOUND and isinstance(in_array, OpenclArray):
-        return pyopencl_to_af_array(in_array, copy)
-    if AF_NUMBA_FOUND and isinstance(in_array, NumbaCudaArray):
-        return numba_to_af_array(in_array, copy)
+    # Match on the type name so that the other packages are never imported here.
+    # If in_array is an instance of one of them, its module is already loaded.
+    for cls in type(in_array).__mro__:
+        converter = _converters.get(cls.__module__ + '.' + cls.__name__)
+        if converter is not None:
+            return converter(in_array, copy)
     return Array(src=in_array)
@@ -13,6 +13,25 @@ Dense Linear Algebra functions (solve, inverse, etc).
 
 from .library import *
 from .array import *
+from .algorithm import imax as _imax
+from .algorithm import sum as _sum
+from .arith import abs as _abs
+from .arith import conjg as _conjg
+from .arith import real as _real
+from .arith import sqrt as _sqrt
+from .data import constant as _constant
+from .data import identity as _identity
+from .data import join as _join
+from .data import moddims as _moddims
+from .data import range as _range
+from .data import reorder as _reorder
+from .data import select as _select
+from .data import tile as _tile
+from .device import eval as _eval
+
+# Largest matrix size for which the batched functions use element wise operations over the
+# whole batch. Larger matrices are processed one at a time with the functions above.
+_BATCH_UNROLL_MAX = 16
 
 def lu(A):
     """
@@ -417,3 +436,251 @@ def is_lapack_available():
     res = c_bool_t(False)
     safe_call(backend.get().af_is_lapack_available(c_pointer(res)))
     return res.value
+
+def _as_batch(A):
+    """
+    Return `A` as a (rows, cols, batch) array and the original batch dimensions.
+    """
+    dims = A._dims4()
+    return _moddims(A, dims[0], dims[1], dims[2] * dims[3]), dims[2:]
+
+def _from_batch(A, batch_dims):
+    dims = A._dims4()
+    return _moddims(A, dims[0], dims[1], batch_dims[0], batch_dims[1])
+
+def _eliminate(M, n, jordan):
+    """
+    Gaussian elimination with partial pivoting, applied to every matrix of the (n, m, batch) array `M`.
+
+    - If `jordan` is True, the first `n` columns are reduced to the identity (Gauss-Jordan).
+    - Otherwise the first `n` columns are replaced by L (strictly lower part, unit diagonal) and U.
+
+    Returns the reduced array, the row permutation and the determinant of the first `n` columns.
+    """
+    batch = M._dims4()[2]
+    rows = _range(n, 1, 1, dim=0, dtype=Dtype.s32)
+    cols = _range(1, M._dims4()[1], 1, dim=1, dtype=Dtype.s32)
+    perm = _tile(rows, 1, 1, batch)
+    det = _constant(1, 1, 1, batch, dtype=M.dtype())
+
+    for k in range(n):
+        # Swap row k with the row of the largest pivot, in every matrix
+        _, p = _imax(_abs(M[k:, k]), 0)
+        p = p.as_type(Dtype.s32) + k
+        is_p = rows == p
+        is_k = rows == k
+        row_k = M[k]
+        row_p = _sum(M * is_p, 0)
+        M = M + is_k * (row_p - row_k) + is_p * (row_k - row_p)
+        perm_k = perm[k]
+        perm_p = _sum(perm * is_p, 0)
+        perm = perm + is_k * (perm_p - perm_k) + is_p * (perm_k - perm_p)
+
+        pivot = M[k, k]
+        det = det * pivot * (1 - 2 * (p != k))
+
+        # A zero pivot means the rest of the column is zero, so the matrix is singular.
+        # Dividing by 1 instead keeps the other steps of that matrix finite.
+        pivot = _select(pivot == 0, 1, pivot)
+
+        if jordan:
+            pivot_row = M[k] / pivot
+            M = M - (M[:, k] * (rows != k)) * pivot_row
+            M[k] = pivot_row
+        else:
+            factors = (M[:, k] / pivot) * (rows > k)
+            M = M - factors * (M[k] * (cols > k))
+            M[:, k] = M[:, k] * (rows <= k) + factors
+
+        # af.eval of several arrays requires equal sizes and types
+        _eval(M)
+        _eval(perm)
+        _eval(det)
+
+    return M, perm, det
+
+def solve_batched(A, B):
+    """
+    Solve A * X = B for a batch of square matrices.
+
+    Parameters
+    ----------
+    A: af.Array
+       - A (n, n, batch) or (n, n, batch0, batch1) arrayfire array.
+
+    B: af.Array
+       - A (n, k, batch) or (n, k, batch0, batch1) arrayfire array.
+
+    Returns
+    -------
+    X: af.Array
+       - A (n, k, batch) or (n, k, batch0, batch1) array, solving every system.
+
+    Note
+    ----
+
+    Matrices up to 16 x 16 are solved together with element wise operations. Larger
+    matrices are solved one at a time with `af.solve`.
+    """
+    n = A._dims4()[0]
+    A3, batch_dims = _as_batch(A)
+    B3, _ = _as_batch(B)
+    k = B3._dims4()[1]
+
+    if n > _BATCH_UNROLL_MAX:
+        X = _constant(0, n, k, B3._dims4()[2], dtype=B.dtype())
+        for i in range(A3._dims4()[2]):
+            X[:, :, i] = solve(A3[:, :, i], B3[:, :, i])
+    else:
+        M, _, _ = _eliminate(_join(1, A3, B3), n, True)
+        X = M[:, n:]
+
+    return _from_batch(X, batch_dims)
+
+def inverse_batched(A):
+    """
+    Invert a batch of square matrices.
+
+    Parameters
+    ----------
+    A: af.Array
+       - A (n, n, batch) or (n, n, batch0, batch1) arrayfire array.
+
+    Returns
+    -------
+    AI: af.Array
+       - The inverse of every matrix in `A`.
+
+    Note
+    ----
+
+    Matrices up to 16 x 16 are inverted together with element wise operations. Larger
+    matrices are inverted one at a time with `af.inverse`.
+    """
+    n = A._dims4()[0]
+    A3, batch_dims = _as_batch(A)
+    batch = A3._dims4()[2]
+
+    if n > _BATCH_UNROLL_MAX:
+        AI = _constant(0, n, n, batch, dtype=A.dtype())
+        for i in range(batch):
+            AI[:, :, i] = inverse(A3[:, :, i])
+        return _from_batch(AI, batch_dims)
+
+    return solve_batched(A, _identity(n, n, batch_dims[0], batch_dims[1], dtype=A.dtype()))
+
+def det_batched(A):
+    """
+    Determinants of a batch of square matrices.
+
+    Parameters
+    ----------
+    A: af.Array
+       - A (n, n, batch) or (n, n, batch0, batch1) arrayfire array.
+
+    Returns
+    -------
+    res: af.Array
+       - A (1, 1, batch) or (1, 1, batch0, batch1) array with the determinant of every matrix.
+    """
+    n = A._dims4()[0]
+    A3, batch_dims = _as_batch(A)
+    batch = A3._dims4()[2]
+
+    if n > _BATCH_UNROLL_MAX:
+        res = _constant(0, 1, 1, batch, dtype=A.dtype())
+        for i in range(batch):
+            res[0, 0, i] = det(A3[:, :, i])
+    else:
+        _, _, res = _eliminate(A3, n, False)
+
+    return _from_batch(res, batch_dims)
+
+def lu_batched(A):
+    """
+    LU decomposition of a batch of square matrices.
+
+    Parameters
+    ----------
+    A: af.Array
+       - A (n, n, batch) or (n, n, batch0, batch1) arrayfire array.
+
+    Returns
+    -------
+    (L,U,P): tuple of af.Arrays
+           - L - Lower triangular matrices.
+           - U - Upper triangular matrices.
+           - P - (n, 1, batch) or (n, 1, batch0, batch1) permutation arrays.
+
+    Note
+    ----
+
+    Every matrix can be reconstructed as in `af.lu`.
+    """
+    n = A._dims4()[0]
+    A3, batch_dims = _as_batch(A)
+    batch = A3._dims4()[2]
+
+    if n > _BATCH_UNROLL_MAX:
+        L = _constant(0, n, n, batch, dtype=A.dtype())
+        U = _constant(0, n, n, batch, dtype=A.dtype())
+        P = _constant(0, n, 1, batch, dtype=Dtype.s32)
+        for i in range(batch):
+            L[:, :, i], U[:, :, i], P[:, :, i] = lu(A3[:, :, i])
+    else:
+        M, P, _ = _eliminate(A3, n, False)
+        rows = _range(n, n, dim=0, dtype=Dtype.s32)
+        cols = _range(n, n, dim=1, dtype=Dtype.s32)
+        L = M * (rows > cols) + (rows == cols)
+        U = M * (rows <= cols)
+
+    return _from_batch(L, batch_dims), _from_batch(U, batch_dims), _from_batch(P, batch_dims)
+
+def cholesky_batched(A, is_upper=True):
+    """
+    Cholesky decomposition of a batch of matrices.
+
+    Parameters
+    ----------
+    A: af.Array
+       A (n, n, batch) or (n, n, batch0, batch1) array of symmetric, positive definite matrices.
+
+    is_upper: optional: bool. default: True
+       Specifies if output `R` is upper triangular (if True) or lower triangular (if False).
+
+    Returns
+    -------
+    (R,info): tuple of af.Array
+           - R - triangular matrices.
+           - info - (1, 1, batch) or (1, 1, batch0, batch1) s32 array.
+                    0 if the decomposition of the matrix was sucessful.
+    """
+    n = A._dims4()[0]
+    A3, batch_dims = _as_batch(A)
+    batch = A3._dims4()[2]
+    info = _constant(0, 1, 1, batch, dtype=Dtype.s32)
+
+    if n > _BATCH_UNROLL_MAX:
+        R = _constant(0, n, n, batch, dtype=A.dtype())
+        for i in range(batch):
+            R[:, :, i], info[0, 0, i] = cholesky(A3[:, :, i], is_upper)
+        return _from_batch(R, batch_dims), _from_batch(info, batch_dims)
+
+    rows = _range(n, 1, 1, dim=0, dtype=Dtype.s32)
+    is_complex = A.is_complex()
+    M = A3
+    L = _constant(0, n, n, batch, dtype=A.dtype())
+    for k in range(n):
+        diag = M[k, k]
+        failed = (info == 0) & ((_real(diag) if is_complex else diag) <= 0)
+        info = info + failed.as_type(Dtype.s32) * (k + 1)
+
+        d = _sqrt(diag)
+        col = (M[:, k] / d) * (rows > k)
+        M = M - col * _conjg(_reorder(col, 1, 0, 2))
+        L[:, k] = col + (rows == k) * d
+        _eval(M, L)
+        _eval(info)
+
+    R = _conjg(_reorder(L, 1, 0, 2)) if is_upper else L
+    return _from_batch(R, batch_dims), _from_batch(info, batch_dims)
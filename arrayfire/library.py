@@ -11,10 +11,10 @@
 Module containing enums and other constants.
 """
 
-import platform
 import ctypes as ct
-import traceback
 import os
+import threading as _threading
+from contextlib import contextmanager as _contextmanager
 
 c_float_t     = ct.c_float
 c_double_t    = ct.c_double
@@ -44,10 +44,11 @@ else:
     # dim_t is long long by default
     c_dim_t = c_longlong_t
     # Change to int for 32 bit x86 and amr architectures
-    if (platform.architecture()[0][0:2] == '32' and
-        (platform.machine()[-2:] == '86' or
-         platform.machine()[0:3] == 'arm')):
-        c_dim_t = c_int_t
+    if (ct.sizeof(c_void_ptr_t) == 4):
+        import platform
+        if (platform.machine()[-2:] == '86' or
+            platform.machine()[0:3] == 'arm'):
+            c_dim_t = c_int_t
 
 try:
     from enum import Enum as _Enum
@@ -513,7 +514,7 @@ def _setup():
         if CUDA_PATH is None:
             CUDA_PATH='/usr/local/cuda/'
 
-        if platform.architecture()[0][:2] == '64':
+        if ct.sizeof(c_void_ptr_t) == 8:
             CUDA_FOUND = os.path.isdir(CUDA_PATH + '/lib64') and os.path.isdir(CUDA_PATH + '/nvvm/lib64')
         else:
             CUDA_FOUND = os.path.isdir(CUDA_PATH + '/lib') and os.path.isdir(CUDA_PATH + '/nvvm/lib')
@@ -525,6 +526,91 @@ def _setup():
 
     return pre, post, AF_SEARCH_PATH, CUDA_FOUND
 
+def _probe_cache_path():
+    try:
+        path = os.environ['AF_PROBE_CACHE']
+    except KeyError:
+        path = None
+
+    if path == '0':
+        return None
+
+    if not path:
+        cache_home = os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache'))
+        path = os.path.join(cache_home, 'arrayfire-python', 'backend_probe.json')
+
+    return path
+
+class _probe_cache(object):
+    """
+    On disk record of backend libraries that loaded but failed to initialize.
+
+    Entries are keyed by the library path and are ignored once the library file
+    changes or the entry is older than `_PROBE_CACHE_TTL` seconds.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = None
+
+    def __read(self):
+        if self.entries is not None:
+            return self.entries
+
+        import json
+        try:
+            with open(self.path) as f:
+                self.entries = json.load(f)
+        except (IOError, OSError, ValueError):
+            self.entries = {}
+        return self.entries
+
+    def __write(self):
+        import json
+        try:
+            dirname = os.path.dirname(self.path)
+            if not os.path.isdir(dirname):
+                os.makedirs(dirname)
+            tmp = self.path + '.' + str(os.getpid())
+            with open(tmp, 'w') as f:
+                json.dump(self.entries, f)
+            os.rename(tmp, self.path)
+        except (IOError, OSError):
+            pass
+
+    def failed(self, stamp):
+        if stamp is None:
+            return False
+
+        import time
+        key, mtime = stamp
+        entry = self.__read().get(key)
+        if entry is None or entry['mtime'] != mtime:
+            return False
+        return time.time() - entry['time'] < _PROBE_CACHE_TTL
+
+    def record(self, stamp, ok):
+        if stamp is None:
+            return
+
+        import time
+        key, mtime = stamp
+        entries = self.__read()
+        if ok:
+            if entries.pop(key, None) is None:
+                return
+        else:
+            entries[key] = {'mtime' : mtime, 'time' : time.time()}
+        self.__write()
+
+_PROBE_CACHE_TTL = 24 * 60 * 60
+
+def _lib_stamp(libname):
+    if not os.path.isfile(libname):
+        return None
+    path = os.path.realpath(libname)
+    return (path, os.path.getmtime(path))
+
 class _clibrary(object):
 
     def __libname(self, name, head='af', ver_major=AF_VER_MAJOR):
@@ -533,30 +619,53 @@ class _clibrary(object):
         libname_full = self.AF_PATH + '/lib/' + libname
         return (libname, libname_full)
 
+    def __check_name(self, name):
+        if (name not in self.__clibs):
+            raise RuntimeError("Invalid backend: %s. Expected one of %s" %
+                               (name, str(list(self.__clibs.keys()))))
+
     def set_unsafe(self, name):
-        lib = self.__clibs[name]
+        self.__check_name(name)
+        self.__select()
+        lib = self.__load(name)
         if (lib is None):
             raise RuntimeError("Backend not found")
         self.__name = name
 
-    def __init__(self):
+    def set_thread_name(self, name):
+        """
+        Override the backend used by the calling thread. None clears the override.
+        """
+        if (name is not None):
+            self.__check_name(name)
+            self.__select()
+            if (self.__load(name) is None):
+                raise RuntimeError("Backend not found")
+        self.__local.name = name
 
-        more_info_str = "Please look at https://github.com/arrayfire/arrayfire-python/wiki for more information."
+    def thread_name(self):
+        return getattr(self.__local, 'name', None)
 
-        pre, post, AF_PATH, CUDA_FOUND = _setup()
+    def __init__(self):
 
-        self.__pre = pre
-        self.__post = post
-        self.AF_PATH = AF_PATH
-        self.CUDA_FOUND = CUDA_FOUND
+        # Search paths are resolved in __select()
+        self.__pre = None
+        self.__post = None
+        self.AF_PATH = None
+        self.CUDA_FOUND = False
 
         self.__name = None
+        self.__local = _threading.local()
+        # Reentrant, __select holds it while loading the libraries
+        self.__lock = _threading.RLock()
 
         self.__clibs = {'cuda'    : None,
                         'opencl'  : None,
                         'cpu'     : None,
                         'unified' : None}
 
+        self.__tried = set()
+
         self.__backend_map = {0 : 'unified',
                               1 : 'cpu'    ,
                               2 : 'cuda'   ,
@@ -568,70 +677,163 @@ class _clibrary(object):
                                    'cuda'    : 2,
                                    'opencl'  : 4}
 
-        # Try to pre-load forge library if it exists
-        libnames = self.__libname('forge', head='', ver_major=FORGE_VER_MAJOR)
+        try:
+            self.__verbose = os.environ['AF_VERBOSE_LOADS'] == '1'
+        except KeyError:
+            self.__verbose = False
+            pass
 
         try:
-            VERBOSE_LOADS = os.environ['AF_VERBOSE_LOADS'] == '1'
+            self.__pinned = os.environ['AF_BACKEND'].lower()
         except KeyError:
-            VERBOSE_LOADS = False
+            self.__pinned = None
             pass
 
+        if (self.__pinned is not None and self.__pinned not in self.__clibs):
+            raise RuntimeError("Invalid value for AF_BACKEND: %s. Expected one of %s" %
+                               (self.__pinned, str(list(self.__clibs.keys()))))
+
+        cache_path = _probe_cache_path()
+        self.__cache = _probe_cache(cache_path) if cache_path else None
+
+    def __load_forge(self):
+        # Try to pre-load forge library if it exists
+        libnames = self.__libname('forge', head='', ver_major=FORGE_VER_MAJOR)
+
         for libname in libnames:
             try:
                 ct.cdll.LoadLibrary(libname)
-                if VERBOSE_LOADS:
+                if self.__verbose:
                     print('Loaded ' + libname)
                 break
             except OSError:
-                if VERBOSE_LOADS:
+                if self.__verbose:
+                    import traceback
                     traceback.print_exc()
                     print('Unable to load ' + libname)
                 pass
 
+    def __load(self, name, probe=False):
+        """
+        Load the library of backend `name` if it has not been tried yet.
+
+        When `probe` is True, the library is only kept if it can create an array.
+        """
+        # Other threads must not see `name` as tried before its library is stored
+        with self.__lock:
+            return self.__load_locked(name, probe)
+
+    def __load_locked(self, name, probe):
+        if name in self.__tried:
+            return self.__clibs[name]
+        self.__tried.add(name)
+
         c_dim4 = c_dim_t*4
         out = c_void_ptr_t(0)
         dims = c_dim4(10, 10, 1, 1)
 
-        # Iterate in reverse order of preference
-        for name in ('cpu', 'opencl', 'cuda', ''):
-            libnames = self.__libname(name)
-            for libname in libnames:
-                try:
-                    ct.cdll.LoadLibrary(libname)
-                    __name = 'unified' if name == '' else name
-                    clib = ct.CDLL(libname)
-                    self.__clibs[__name] = clib
-                    err = clib.af_randu(c_pointer(out), 4, c_pointer(dims), Dtype.f32.value)
-                    if (err == ERR.NONE.value):
-                        self.__name = __name
-                        clib.af_release_array(out)
-                        if VERBOSE_LOADS:
-                            print('Loaded ' + libname)
-                        break;
-                except OSError:
-                    if VERBOSE_LOADS:
-                        traceback.print_exc()
-                        print('Unable to load ' + libname)
-                    pass
-
-        if (self.__name is None):
+        libnames = self.__libname('' if name == 'unified' else name)
+        for libname in libnames:
+            stamp = _lib_stamp(libname)
+            # An explicitly pinned backend is always tried
+            if (probe and self.__pinned is None and
+                self.__cache is not None and self.__cache.failed(stamp)):
+                if self.__verbose:
+                    print('Skipping ' + libname + ' (failed to initialize earlier)')
+                continue
+
+            try:
+                clib = ct.CDLL(libname)
+            except OSError:
+                if self.__verbose:
+                    import traceback
+                    traceback.print_exc()
+                    print('Unable to load ' + libname)
+                continue
+
+            self.__clibs[name] = clib
+            if not probe:
+                break
+
+            err = clib.af_randu(c_pointer(out), 4, c_pointer(dims), Dtype.f32.value)
+            ok = (err == ERR.NONE.value)
+            if self.__cache is not None:
+                self.__cache.record(stamp, ok)
+            if ok:
+                clib.af_release_array(out)
+                if self.__verbose:
+                    print('Loaded ' + libname)
+                return clib
+
+            # Keep the library around for set_backend(name, unsafe=True)
+            break
+
+        return None if probe else self.__clibs[name]
+
+    def __select(self):
+        """
+        Find the backend to use. Only runs once, on first use of the library.
+        """
+        if self.__name is not None:
+            return
+
+        with self.__lock:
+            if self.__name is not None:
+                return
+
+            more_info_str = "Please look at https://github.com/arrayfire/arrayfire-python/wiki for more information."
+
+            pre, post, AF_PATH, CUDA_FOUND = _setup()
+
+            self.__pre = pre
+            self.__post = post
+            self.AF_PATH = AF_PATH
+            self.CUDA_FOUND = CUDA_FOUND
+
+            self.__load_forge()
+
+            if self.__pinned is not None:
+                names = (self.__pinned,)
+            else:
+                # Order of preference
+                names = ('unified', 'cuda', 'opencl', 'cpu')
+
+            for name in names:
+                if self.__load(name, probe=True) is not None:
+                    self.__name = name
+                    return
+
             raise RuntimeError("Could not load any ArrayFire libraries.\n" + more_info_str)
 
     def get_id(self, name):
+        if (name not in self.__backend_name_map):
+            raise RuntimeError("Invalid backend: %s. Expected one of %s" %
+                               (name, str(list(self.__backend_name_map.keys()))))
         return self.__backend_name_map[name]
 
     def get_name(self, bk_id):
         return self.__backend_map[bk_id]
 
     def get(self):
-        return self.__clibs[self.__name]
+        clib = self.__clibs[self.name()]
+        hook = getattr(self.__local, 'hook', None)
+        return clib if hook is None else hook(clib)
+
+    def _set_thread_hook(self, hook):
+        """
+        Wrap the library returned by get() in the calling thread. For internal use only.
+        """
+        self.__local.hook = hook
 
     def name(self):
-        return self.__name
+        name = getattr(self.__local, 'name', None) or self.__name
+        if name is None:
+            self.__select()
+            name = self.__name
+        return name
 
     def is_unified(self):
-        return self.__name == 'unified'
+        return self.name() == 'unified'
 
     def parse(self, res):
         lst = []
@@ -642,6 +844,14 @@ class _clibrary(object):
 
 backend = _clibrary()
 
+def _check_backend_change(name, unsafe):
+    """
+    Raise an error if the backend can not be changed to `name`.
+    """
+    backend.get_id(name)
+    if (backend.is_unified() == False and unsafe == False):
+        raise RuntimeError("Can not change backend to %s after loading %s" % (name, backend.name()))
+
 def set_backend(name, unsafe=False):
     """
     Set a specific backend by name
@@ -653,9 +863,14 @@ def set_backend(name, unsafe=False):
 
     unsafe : optional: bool. Default: False.
            If False, does not switch backend if current backend is not unified backend.
+
+    Note
+    ----
+
+    - With the unified backend, the active backend is tracked per host thread by the library.
+    - Otherwise the switch applies to every thread that is not inside a `backend_scope`.
     """
-    if (backend.is_unified() == False and unsafe == False):
-        raise RuntimeError("Can not change backend to %s after loading %s" % (name, backend.name()))
+    _check_backend_change(name, unsafe)
 
     if (backend.is_unified()):
         safe_call(backend.get().af_set_backend(backend.get_id(name)))
@@ -663,6 +878,54 @@ def set_backend(name, unsafe=False):
         backend.set_unsafe(name)
     return
 
+@_contextmanager
+def backend_scope(name, unsafe=False):
+    """
+    Use a specific backend in the calling thread for the duration of a `with` block.
+
+    Parameters
+    ----------
+
+    name : str.
+         One of 'cpu', 'cuda', 'opencl'.
+
+    unsafe : optional: bool. Default: False.
+           If False, does not switch backend if current backend is not unified backend,
+           as in `set_backend`. Using the current backend is always allowed.
+
+    Note
+    ----
+
+    - Other threads keep using their own backend while the block is active.
+    - The previous backend of the calling thread is restored when the block exits.
+    - Arrays created inside the block belong to `name` and must not be mixed with arrays from other backends.
+
+    Example
+    -------
+
+    >>> import arrayfire as af
+    >>> with af.backend_scope('cpu'):
+    ...     a = af.randu(3, 3)
+    ...
+    """
+    if (backend.is_unified()):
+        _check_backend_change(name, unsafe)
+        prev = get_active_backend()
+        safe_call(backend.get().af_set_backend(backend.get_id(name)))
+        try:
+            yield
+        finally:
+            safe_call(backend.get().af_set_backend(backend.get_id(prev)))
+    else:
+        if (name != backend.name()):
+            _check_backend_change(name, unsafe)
+        prev = backend.thread_name()
+        backend.set_thread_name(name)
+        try:
+            yield
+        finally:
+            backend.set_thread_name(prev)
+
 def get_backend():
     """
     Return the name of the backend
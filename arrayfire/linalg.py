@@ -0,0 +1,993 @@
+#######################################################
+# Copyright (c) 2015, ArrayFire
+# All rights reserved.
+#
+# This file is distributed under 3-clause BSD license.
+# The complete license agreement can be obtained at:
+# http://arrayfire.com/licenses/BSD-3-Clause
+########################################################
+
+"""
+Iterative solvers and other linear algebra routines built on arrayfire.blas and arrayfire.lapack.
+
+    >>> import arrayfire as af
+    >>> A = af.sparse.create_sparse_from_dense(dense)
+    >>> x, info = af.linalg.cg(A, b, M=af.linalg.jacobi(A))
+
+"""
+
+from .library import *
+from .array import *
+from .array import _to_device_scalar
+from .algorithm import max as _max
+from .algorithm import sum as _sum
+from .algorithm import where as _where
+from .algorithm import _lookup
+from .arith import abs as _abs
+from .arith import log as _log
+from .arith import maxof as _maxof
+from .arith import sqrt as _sqrt
+from .blas import dot as _dot
+from .blas import matmul as _matmul
+from .data import constant as _constant
+from .data import diag as _diag
+from .data import flat as _flat
+from .data import identity as _identity
+from .data import join as _join
+from .data import lower as _lower
+from .data import select as _select
+from .data import upper as _upper
+from .device import eval as _eval
+from .device import get_device as _get_device
+from .device import is_dbl_supported as _is_dbl_supported
+from .device import set_device as _set_device
+from .interop import to_array as _to_array
+from .interop import AF_NUMPY_FOUND as _AF_NUMPY_FOUND
+from .lapack import cholesky as _cholesky
+from .lapack import cholesky_inplace as _cholesky_inplace
+from .lapack import lu_inplace as _lu_inplace
+from .lapack import qr as _qr
+from .lapack import qr_inplace as _qr_inplace
+from .lapack import solve as _solve
+from .lapack import solve_lu as _solve_lu
+from .lapack import svd as _svd
+from .random import randn as _randn
+from .sparse import _coo_info
+import collections as _collections
+import threading as _threading
+
+def _operator(A):
+    """
+    Return a function computing A * v for a matrix or a callable.
+    """
+    if A is None:
+        return lambda v: v
+    if isinstance(A, Array):
+        return lambda v: _matmul(A, v)
+    return A
+
+def _inner(lhs, rhs):
+    opts = MATPROP.CONJ if lhs.is_complex() else MATPROP.NONE
+    return _dot(lhs, rhs, lhs_opts=opts, return_scalar=True, lazy=True)
+
+def _norm(v):
+    return _to_device_scalar(_sqrt(_abs(_inner(v, v))))
+
+def _check_args(b, x0, tol, maxiter, check_every):
+    b = _flat(b)
+    if x0 is None:
+        x0 = _constant(0, b.elements(), dtype=b.dtype())
+    else:
+        # The iterates are evaluated together, which requires the same type
+        x0 = _flat(x0)
+        if x0.dtype() != b.dtype():
+            x0 = x0.as_type(b.dtype())
+    if maxiter is None:
+        maxiter = 10 * b.elements()
+    if check_every < 1:
+        raise RuntimeError("check_every must be at least 1")
+    # Converged when |r|^2 <= tol^2 * |b|^2
+    threshold = tol * tol * abs(_dot(b, b, lhs_opts=MATPROP.CONJ if b.is_complex() else MATPROP.NONE,
+                                     return_scalar=True))
+    return b, x0, maxiter, threshold
+
+def _converged(r, threshold):
+    """
+    Copy the squared norm of the residual to the host and compare it with the threshold.
+
+    Returns True if converged, False if not and None if the iteration broke down.
+    """
+    rr = abs(complex(_inner(r, r)))
+    if rr != rr or rr == float('inf'):
+        return None
+    return rr <= threshold
+
+def jacobi(A):
+    """
+    Jacobi (diagonal) preconditioner.
+
+    Parameters
+    ----------
+
+    A : af.Array.
+        A dense or sparse square matrix with a non zero diagonal.
+
+    Returns
+    -------
+
+    M : callable.
+        Function computing inv(diag(A)) * r.
+    """
+    if A.is_sparse():
+        values, row_idx, col_idx = _coo_info(A)
+        idx = _where(row_idx == col_idx)
+        d = _constant(1, A.dims()[0], dtype=values.dtype())
+        d[_lookup(row_idx, idx, 0)] = _lookup(values, idx, 0)
+    else:
+        d = _diag(A, extract=True)
+
+    inv_d = _flat(1 / d)
+    return lambda r: inv_d * r
+
+def cg(A, b, x0=None, tol=1E-5, maxiter=None, M=None, check_every=10):
+    """
+    Solve A * x = b with the (preconditioned) conjugate gradient method.
+
+    The scalars of the iteration stay on the device. The residual is copied to
+    the host before the first iteration and then only every `check_every`
+    iterations to test for convergence.
+
+    Parameters
+    ----------
+
+    A : af.Array or callable.
+        A dense or sparse hermitian positive definite matrix, or a function computing A * v.
+
+    b : af.Array.
+        The right hand side vector.
+
+    x0 : optional: af.Array. default: None.
+        The initial guess, converted to the type of `b`. Defaults to zeros.
+
+    tol : optional: scalar. default: 1E-5.
+        Stop when norm(b - A * x) <= tol * norm(b).
+
+    maxiter : optional: int. default: None.
+        The maximum number of iterations. Defaults to 10 times the size of `b`.
+
+    M : optional: af.Array or callable. default: None.
+        The preconditioner, approximating inv(A). For example `jacobi(A)`.
+
+    check_every : optional: int. default: 10.
+        The number of iterations between convergence checks.
+
+    Returns
+    -------
+
+    (x, info) where
+    x : af.Array containing the solution.
+    info : int.
+        - 0 if converged.
+        - The number of iterations if not converged after `maxiter` iterations.
+        - -1 if the iteration broke down.
+    """
+    matvec = _operator(A)
+    precond = _operator(M)
+    b, x, maxiter, threshold = _check_args(b, x0, tol, maxiter, check_every)
+
+    r = b - _flat(matvec(x))
+    # Also avoids 0 / 0 in the first step when b is zero or x0 is the solution
+    if _converged(r, threshold):
+        return x, 0
+
+    z = precond(r)
+    p = z
+    rz = _inner(r, z)
+
+    for it in range(1, maxiter + 1):
+        Ap = _flat(matvec(p))
+        alpha = rz / _inner(p, Ap)
+        x = x + alpha * p
+        r = r - alpha * Ap
+
+        if it % check_every == 0 or it == maxiter:
+            done = _converged(r, threshold)
+            if done is None:
+                return x, -1
+            if done:
+                return x, 0
+
+        z = precond(r)
+        rz_new = _inner(r, z)
+        p = z + (rz_new / rz) * p
+        rz = rz_new
+        _eval(x, r, p)
+
+    return x, maxiter
+
+def bicgstab(A, b, x0=None, tol=1E-5, maxiter=None, M=None, check_every=10):
+    """
+    Solve A * x = b with the (preconditioned) BiCGSTAB method.
+
+    The scalars of the iteration stay on the device. The residual is copied to
+    the host before the first iteration and then only every `check_every`
+    iterations to test for convergence.
+
+    Parameters
+    ----------
+
+    A : af.Array or callable.
+        A dense or sparse square matrix, or a function computing A * v.
+
+    b : af.Array.
+        The right hand side vector.
+
+    x0 : optional: af.Array. default: None.
+        The initial guess, converted to the type of `b`. Defaults to zeros.
+
+    tol : optional: scalar. default: 1E-5.
+        Stop when norm(b - A * x) <= tol * norm(b).
+
+    maxiter : optional: int. default: None.
+        The maximum number of iterations. Defaults to 10 times the size of `b`.
+
+    M : optional: af.Array or callable. default: None.
+        The preconditioner, approximating inv(A). For example `jacobi(A)`.
+
+    check_every : optional: int. default: 10.
+        The number of iterations between convergence checks.
+
+    Returns
+    -------
+
+    (x, info) where
+    x : af.Array containing the solution.
+    info : int.
+        - 0 if converged.
+        - The number of iterations if not converged after `maxiter` iterations.
+        - -1 if the iteration broke down.
+    """
+    matvec = _operator(A)
+    precond = _operator(M)
+    b, x, maxiter, threshold = _check_args(b, x0, tol, maxiter, check_every)
+
+    r = b - _flat(matvec(x))
+    # Also avoids 0 / 0 in the first step when b is zero or x0 is the solution
+    if _converged(r, threshold):
+        return x, 0
+
+    r_hat = r
+    p = r
+    rho = _inner(r_hat, r)
+
+    for it in range(1, maxiter + 1):
+        p_hat = precond(p)
+        v = _flat(matvec(p_hat))
+        alpha = rho / _inner(r_hat, v)
+        s = r - alpha * v
+
+        s_hat = precond(s)
+        t = _flat(matvec(s_hat))
+        omega = _inner(t, s) / _inner(t, t)
+        x = x + alpha * p_hat + omega * s_hat
+        r = s - omega * t
+
+        if it % check_every == 0 or it == maxiter:
+            done = _converged(r, threshold)
+            if done is None:
+                return x, -1
+            if done:
+                return x, 0
+
+        rho_new = _inner(r_hat, r)
+        beta = (rho_new / rho) * (alpha / omega)
+        p = r + beta * (p - omega * v)
+        rho = rho_new
+        _eval(x, r, p)
+
+    return x, maxiter
+
+def gmres(A, b, x0=None, tol=1E-5, restart=20, maxiter=None, M=None):
+    """
+    Solve A * x = b with the restarted (right preconditioned) GMRES method.
+
+    The Krylov basis and the Hessenberg matrix stay on the device, and the small
+    least squares problem is solved with af.solve. The residual is copied to the
+    host once every restart cycle to test for convergence.
+
+    Parameters
+    ----------
+
+    A : af.Array or callable.
+        A dense or sparse square matrix, or a function computing A * v.
+
+    b : af.Array.
+        The right hand side vector.
+
+    x0 : optional: af.Array. default: None.
+        The initial guess, converted to the type of `b`. Defaults to zeros.
+
+    tol : optional: scalar. default: 1E-5.
+        Stop when norm(b - A * x) <= tol * norm(b).
+
+    restart : optional: int. default: 20.
+        The number of iterations between restarts.
+
+    maxiter : optional: int. default: None.
+        The maximum number of iterations. Defaults to 10 times the size of `b`.
+
+    M : optional: af.Array or callable. default: None.
+        The preconditioner, approximating inv(A). For example `jacobi(A)`.
+
+    Returns
+    -------
+
+    (x, info) where
+    x : af.Array containing the solution.
+    info : int.
+        - 0 if converged.
+        - The number of iterations if not converged after `maxiter` iterations.
+        - -1 if the iteration broke down.
+    """
+    matvec = _operator(A)
+    precond = _operator(M)
+    b, x, maxiter, threshold = _check_args(b, x0, tol, maxiter, 1)
+    n = b.elements()
+    dtype = b.dtype()
+    # Avoids a division by zero when the basis can not be extended (lucky breakdown)
+    tiny = 1E-30 if dtype in (Dtype.f32, Dtype.c32) else 1E-300
+
+    r = b - _flat(matvec(x))
+    it = 0
+    while it < maxiter:
+        done = _converged(r, threshold)
+        if done is None:
+            return x, -1
+        if done:
+            return x, 0
+
+        m = min(restart, maxiter - it)
+        V = _constant(0, n, m + 1, dtype=dtype)
+        H = _constant(0, m + 1, m, dtype=dtype)
+        beta = _norm(r)
+        V[:, 0] = r / beta
+
+        for j in range(m):
+            w = _flat(matvec(precond(V[:, j])))
+            # Classical Gram-Schmidt, applied twice for stability
+            h = _matmul(V[:, :j + 1], w, lhs_opts=MATPROP.CTRANS)
+            w = w - _flat(_matmul(V[:, :j + 1], h))
+            h2 = _matmul(V[:, :j + 1], w, lhs_opts=MATPROP.CTRANS)
+            w = w - _flat(_matmul(V[:, :j + 1], h2))
+            h_next = _maxof(_norm(w), tiny)
+            H[:j + 2, j] = _join(0, h + h2, h_next.as_type(dtype))
+            V[:, j + 1] = w / h_next
+            _eval(V)
+            _eval(H)
+
+        e1 = _constant(0, m + 1, dtype=dtype)
+        e1[0] = beta
+        y = _solve(H, e1)
+        x = x + _flat(precond(_flat(_matmul(V[:, :m], y))))
+        r = b - _flat(matvec(x))
+        it += m
+
+    done = _converged(r, threshold)
+    if done is None:
+        return x, -1
+    return x, 0 if done else maxiter
+
+class Factorization(object):
+    """
+    A factorized square matrix, kept on the device for repeated solves.
+
+    Created by `factorize`.
+
+    Attributes
+    ----------
+
+    kind : str.
+        One of 'lu', 'cholesky' or 'qr'.
+
+    factors : tuple of af.Array.
+        - 'lu'       : (LU, P) as returned by af.lu_inplace.
+        - 'cholesky' : (R,) upper triangular, with A = R^H * R.
+        - 'qr'       : (Q, R).
+    """
+
+    def __init__(self, kind, factors, n, dtype):
+        self.kind = kind
+        self.factors = factors
+        self.n = n
+        self.dtype = dtype
+
+    def solve(self, B):
+        """
+        Solve A * X = B.
+
+        Parameters
+        ----------
+
+        B : af.Array.
+            A 1 or 2 dimensional array of right hand sides.
+
+        Returns
+        -------
+
+        X : af.Array.
+        """
+        if self.kind == 'lu':
+            LU, P = self.factors
+            return _solve_lu(LU, P, B)
+        if self.kind == 'cholesky':
+            R, = self.factors
+            Y = _solve(transpose(R, conj=True), B, MATPROP.LOWER)
+            return _solve(R, Y, MATPROP.UPPER)
+        Q, R = self.factors
+        return _solve(R, _matmul(Q, B, lhs_opts=MATPROP.CTRANS), MATPROP.UPPER)
+
+    def inverse(self):
+        """
+        The inverse of the factorized matrix.
+        """
+        return self.solve(_identity(self.n, self.n, dtype=self.dtype))
+
+    def logdet(self):
+        """
+        The natural logarithm of the absolute value of the determinant.
+        """
+        R = self.factors[0]
+        res = _sum(_log(_abs(_diag(R, extract=True))))
+        return 2 * res if self.kind == 'cholesky' else res
+
+def _factorize(A, kind):
+    dims = A._dims4()
+    if dims[0] != dims[1] or dims[2] != 1 or dims[3] != 1:
+        raise RuntimeError("A square matrix is required")
+
+    if kind == 'lu':
+        LU = A.copy()
+        P = _lu_inplace(LU)
+        factors = (LU, P)
+    elif kind == 'cholesky':
+        R = A.copy()
+        info = _cholesky_inplace(R, True)
+        if info != 0:
+            raise RuntimeError("Matrix is not positive definite")
+        factors = (_upper(R),)
+    elif kind == 'qr':
+        Q, R, _ = _qr(A)
+        factors = (Q, R)
+    else:
+        raise RuntimeError("Unsupported factorization: %s" % kind)
+
+    return Factorization(kind, factors, dims[0], A.dtype())
+
+class FactorCache(object):
+    """
+    Remembers the factorizations of the most recently used matrices.
+
+    Matrices are identified by the af.Array object and its arrayfire handle.
+    Assigning to an af.Array (for example `A[0, 0] = 1`) gives it a new handle,
+    so stale factors are never returned. The released handle may be given to
+    another array later, so a cached entry is only used for the same af.Array
+    object it was created for. The cache keeps a reference to that object.
+
+    Parameters
+    ----------
+
+    maxsize : optional: int. default: 8.
+        The maximum number of factorizations kept. The least recently used is evicted first.
+
+    Note
+    ----
+
+    Functions that modify their input in place (for example af.lu_inplace) keep the handle,
+    so `clear` must be called after using them on a cached matrix.
+    """
+
+    def __init__(self, maxsize=8):
+        self.maxsize = maxsize
+        self._entries = _collections.OrderedDict()
+        self._lock = _threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """
+        Remove all the factorizations.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def factorize(self, A, kind='lu'):
+        """
+        Same as `af.linalg.factorize`, returning the cached factorization if available.
+        """
+        key = (backend.name(), _get_device(), A.arr.value, kind)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is A:
+                # Most recently used last
+                self._entries[key] = self._entries.pop(key)
+                return entry[1]
+
+        fact = _factorize(A, kind)
+
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (A, fact)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return fact
+
+def factorize(A, kind='lu', cache=None):
+    """
+    Factorize a square matrix once, to solve many systems with it.
+
+    Parameters
+    ----------
+
+    A : af.Array.
+        A 2 dimensional square matrix.
+
+    kind : optional: str. default: 'lu'.
+        - 'lu'       : LU decomposition with partial pivoting.
+        - 'cholesky' : Cholesky decomposition. `A` must be hermitian positive definite.
+        - 'qr'       : QR decomposition.
+
+    cache : optional: FactorCache. default: None.
+        If not None, the factorization is looked up in and added to `cache`.
+
+    Returns
+    -------
+
+    fact : Factorization.
+        Use `fact.solve(B)`, `fact.inverse()` and `fact.logdet()`.
+
+    Examples
+    --------
+
+    >>> import arrayfire as af
+    >>> fact = af.linalg.factorize(A, 'cholesky')
+    >>> for b in rhs:
+    ...     x = fact.solve(b)
+
+    """
+    if cache is not None:
+        return cache.factorize(A, kind)
+    return _factorize(A, kind)
+
+def solve_refined(A, B, tol=None, maxiter=10, kind='lu'):
+    """
+    Solve A * X = B in double precision, factorizing A in single precision.
+
+    The single precision factors give a first solution, which is improved by
+    iterative refinement: the residual B - A * X is computed in double precision
+    and the correction is solved with the same factors.
+
+    Parameters
+    ----------
+
+    A : af.Array.
+        A 2 dimensional square matrix.
+
+    B : af.Array.
+        A 1 or 2 dimensional array of right hand sides.
+
+    tol : optional: scalar. default: None.
+        Stop when max(abs(B - A * X)) <= tol * (max(abs(A)) * max(abs(X)) + max(abs(B))).
+        Defaults to the double precision epsilon times sqrt(n).
+
+    maxiter : optional: int. default: 10.
+        The maximum number of refinement steps.
+
+    kind : optional: str. default: 'lu'.
+        The single precision factorization, 'lu' or 'cholesky'. See `factorize`.
+
+    Returns
+    -------
+
+    X : af.Array.
+        The solution, as f64 (or c64 if A or B are complex).
+
+    Note
+    ----
+
+    - If the refinement stops improving the residual (for example because A is
+      badly conditioned), the system is solved in double precision instead.
+    - If the device does not support double precision, the single precision
+      solution is returned.
+    """
+    is_complex = A.is_complex() or B.is_complex()
+    single = Dtype.c32 if is_complex else Dtype.f32
+    double = Dtype.c64 if is_complex else Dtype.f64
+
+    fact = _factorize(A.as_type(single), kind)
+    if not _is_dbl_supported():
+        return fact.solve(B.as_type(single))
+
+    A64 = A.as_type(double)
+    B64 = B.as_type(double)
+    X = fact.solve(B.as_type(single)).as_type(double)
+
+    n = A.dims()[0]
+    if tol is None:
+        tol = 2.220446049250313E-16 * n ** 0.5
+    norm_A = _max(_abs(A64))
+    norm_B = _max(_abs(B64))
+
+    prev = None
+    for it in range(maxiter):
+        R = B64 - _matmul(A64, X)
+        res = _max(_abs(R))
+        if res <= tol * (norm_A * _max(_abs(X)) + norm_B):
+            return X
+        if prev is not None and not res < 0.5 * prev:
+            break
+        prev = res
+        X = X + fact.solve(R.as_type(single)).as_type(double)
+
+    return _solve(A64, B64)
+
+def _cholesky_qr(Y):
+    """
+    Thin QR decomposition of a tall matrix, Y = Q * R (shifted CholeskyQR, applied twice).
+
+    Only small (cols, cols) matrices are factorized, so Y can have millions of rows.
+    """
+    cols = Y._dims4()[1]
+    dtype = Y.dtype()
+    eps = 1.1920929E-07 if dtype in (Dtype.f32, Dtype.c32) else 2.220446049250313E-16
+    eye = _identity(cols, cols, dtype=dtype)
+
+    R = eye
+    for step in range(2):
+        G = _matmul(Y, Y, lhs_opts=MATPROP.CTRANS)
+        # The shift keeps the Cholesky decomposition defined when Y is (nearly) rank deficient.
+        # The second pass restores the orthogonality lost to it.
+        shift = 10 * eps * abs(_sum(_diag(G, extract=True)))
+        R_step, info = _cholesky(G + shift * eye)
+        if info != 0:
+            raise RuntimeError("Orthogonalization failed")
+        Y = _matmul(Y, _solve(R_step, eye, MATPROP.UPPER))
+        R = _matmul(R_step, R)
+
+    return Y, R
+
+def svds(A, k, oversample=10, n_iter=2):
+    """
+    Truncated singular value decomposition using randomized range finding.
+
+    Computes an approximation of the `k` largest singular values and vectors
+    of `A`, using only products with `A` and decompositions of small matrices.
+
+    Parameters
+    ----------
+
+    A : af.Array.
+        A 2 dimensional dense or sparse matrix.
+
+    k : int.
+        The number of singular values.
+
+    oversample : optional: int. default: 10.
+        The number of extra random directions. Larger values improve the accuracy.
+
+    n_iter : optional: int. default: 2.
+        The number of power iterations. Use more when the singular values decay slowly.
+
+    Returns
+    -------
+
+    (U,S,Vt): tuple of af.Arrays
+           - U - (m, k) matrix with orthonormal columns.
+           - S - The `k` largest singular values, in decreasing order.
+           - Vt - (k, n) matrix with orthonormal rows.
+
+    Note
+    ----
+
+    A low rank approximation of `A` is af.matmul(af.matmul(U, af.diag(S, 0, False)), Vt).
+    """
+    m, n = A._dims4()[:2]
+    rank = min(k + oversample, m, n)
+    if k > rank:
+        raise RuntimeError("k must not be larger than the size of A")
+
+    Q, _ = _cholesky_qr(_matmul(A, _randn(n, rank, dtype=A.dtype())))
+    for it in range(n_iter):
+        Z, _ = _cholesky_qr(_matmul(A, Q, lhs_opts=MATPROP.CTRANS))
+        Q, _ = _cholesky_qr(_matmul(A, Z))
+
+    # A ~ Q * Q^H * A = Q * (Qb * Rb)^H, with a small SVD of Rb^H
+    Qb, Rb = _cholesky_qr(_matmul(A, Q, lhs_opts=MATPROP.CTRANS))
+    Us, S, Vts = _svd(transpose(Rb, conj=True))
+
+    U = _matmul(Q, Us[:, :k])
+    Vt = _matmul(Vts[:k, :], Qb, rhs_opts=MATPROP.CTRANS)
+    return U, S[:k], Vt
+
+class _Prefetch(object):
+    """
+    Runs `load(item)` on a background thread, with the backend and device of the calling thread.
+    """
+
+    def __init__(self, load, item):
+        self._result = None
+        self._error = None
+        self._thread = _threading.Thread(target=self._run,
+                                         args=(load, item, get_active_backend(), _get_device()))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self, load, item, bk_name, dev):
+        try:
+            with backend_scope(bk_name, unsafe=True):
+                if _get_device() != dev:
+                    _set_device(dev)
+                self._result = load(item)
+        except BaseException as e:
+            self._error = e
+
+    def get(self):
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+def _load_block(src, rows, cols):
+    block = src[rows[0]:rows[1], cols[0]:cols[1]]
+    if not isinstance(block, Array):
+        block = _to_array(block)
+    _eval(block)
+    return block
+
+def matmul_tiled(A, B, block=4096, out=None):
+    """
+    Matrix multiplication of matrices that do not fit in device memory.
+
+    The output is computed one (block x block) tile at a time, accumulating the
+    products of the blocks of `A` and `B` on the device. The next pair of blocks is
+    copied to the device on a background thread while the current pair is multiplied.
+
+    Parameters
+    ----------
+
+    A : numpy.ndarray / numpy.memmap or af.Array.
+        A 2 dimensional (m, k) matrix.
+
+    B : numpy.ndarray / numpy.memmap or af.Array.
+        A 2 dimensional (k, n) matrix.
+
+    block : optional: int or (int, int, int). default: 4096.
+        The size of the blocks, or the number of rows of `A`, columns of `A`
+        and columns of `B` in each block.
+
+    out : optional: numpy.ndarray / numpy.memmap. default: None.
+        (m, n) array to store the result in.
+
+    Returns
+    -------
+
+    out : numpy.ndarray
+        The product of `A` and `B`.
+
+    Note
+    ----
+    Requires numpy. Each tile of the output is copied to `out` once.
+    """
+    if not _AF_NUMPY_FOUND:
+        raise RuntimeError("numpy is required for matmul_tiled")
+    import numpy as np
+
+    if isinstance(block, int):
+        block = (block, block, block)
+    m, k = A.shape if not isinstance(A, Array) else A._dims4()[:2]
+    k2, n = B.shape if not isinstance(B, Array) else B._dims4()[:2]
+    if k != k2:
+        raise RuntimeError("Dimension mismatch in matmul_tiled")
+
+    def spans(size, step):
+        return [(start, min(start + step, size)) for start in range(0, size, step)]
+
+    tasks = []
+    for rows in spans(m, block[0]):
+        for cols in spans(n, block[2]):
+            for inner in spans(k, block[1]):
+                tasks.append((rows, cols, inner))
+
+    def load(task):
+        rows, cols, inner = task
+        return _load_block(A, rows, inner), _load_block(B, inner, cols)
+
+    acc = None
+    pending = _Prefetch(load, tasks[0]) if tasks else None
+    for t, task in enumerate(tasks):
+        lhs, rhs = pending.get()
+        if t + 1 < len(tasks):
+            pending = _Prefetch(load, tasks[t + 1])
+
+        prod = _matmul(lhs, rhs)
+        acc = prod if acc is None else acc + prod
+        _eval(acc)
+
+        rows, cols, inner = task
+        if inner[1] == k:
+            tile = acc.to_ndarray()
+            if out is None:
+                out = np.empty((m, n), dtype=tile.dtype)
+            out[rows[0]:rows[1], cols[0]:cols[1]] = tile
+            acc = None
+
+    return out
+
+def _row_blocks(A, block_rows):
+    """
+    Yield (first row, af.Array) for every block of rows of `A`.
+
+    The blocks of arrays are copied to the device on a background thread, one block ahead.
+    """
+    if isinstance(A, Array) or hasattr(A, 'shape'):
+        m = A.dims()[0] if isinstance(A, Array) else A.shape[0]
+        spans = [(start, min(start + block_rows, m)) for start in range(0, m, block_rows)]
+
+        def load(rows):
+            return _load_block(A, rows, (0, None))
+
+        pending = _Prefetch(load, spans[0]) if spans else None
+        for t, rows in enumerate(spans):
+            block = pending.get()
+            if t + 1 < len(spans):
+                pending = _Prefetch(load, spans[t + 1])
+            yield rows[0], block
+        return
+
+    start = 0
+    for block in A:
+        if not isinstance(block, Array):
+            block = _to_array(block)
+        yield start, block
+        start += block.dims()[0]
+
+def _householder_q(V, tau):
+    """
+    Thin Q factor of the Householder reflectors below the diagonal of `V`, as left by af.qr_inplace.
+
+    Uses Q = I - V * T * V^H, where inv(T) = diag(1 / tau) + strictly upper part of V^H * V,
+    so only (rows, r) and (r, r) matrices are created.
+    """
+    rows, r = V._dims4()[:2]
+    dtype = V.dtype()
+    # A reflector with tau = 0 is the identity. Dropping its vector keeps T finite.
+    keep = (tau != 0).as_type(dtype)
+    V = _matmul(_lower(V, True), _diag(keep, 0, False))
+    inv_tau = 1 / _select(tau == 0, 1, tau)
+    T_inv = _upper(_matmul(V, V, lhs_opts=MATPROP.CTRANS), True) + _diag(inv_tau - 1, 0, False)
+    T = _solve(T_inv, _identity(r, r, dtype=dtype), MATPROP.UPPER)
+    return _identity(rows, r, dtype=dtype) - _matmul(_matmul(V, T), V[:r, :], rhs_opts=MATPROP.CTRANS)
+
+def _qr_factor(block, return_q):
+    """
+    Thin QR decomposition of a block. Only R is computed if `return_q` is False.
+    """
+    rows, cols = block._dims4()[:2]
+    r = min(rows, cols)
+    packed = block.copy()
+    tau = _flat(_qr_inplace(packed))
+    R = _upper(packed[:r, :])
+    if not return_q:
+        return None, R
+    return _householder_q(packed[:, :r], tau[:r]), R
+
+class _TSQRNode(object):
+    """
+    The R factor of a group of consecutive blocks.
+
+    The Q factor of every block in the group is `leaves[i].Q * leaves[i].M`.
+    """
+    def __init__(self, level, R, leaves):
+        self.level = level
+        self.R = R
+        self.leaves = leaves
+
+class _TSQRLeaf(object):
+    """
+    The thin Q factor of a block and the product M of the Q factors it was merged with.
+    """
+    def __init__(self, start, Q):
+        self.start = start
+        self.Q = Q
+        self.M = None
+
+def _tsqr_merge(top, bottom, return_q):
+    rows = top.R.dims()[0]
+    Q, R = _qr_factor(_join(0, top.R, bottom.R), return_q)
+    if return_q:
+        for node, part in ((top, Q[:rows, :]), (bottom, Q[rows:, :])):
+            for leaf in node.leaves:
+                leaf.M = part if leaf.M is None else _matmul(leaf.M, part)
+    return _TSQRNode(max(top.level, bottom.level) + 1, R, top.leaves + bottom.leaves)
+
+def tsqr(A, block_rows=None, return_q=False):
+    """
+    QR decomposition of a tall and skinny matrix, one block of rows at a time.
+
+    Every block of rows is factorized independently, and the R factors are
+    combined pairwise up a binary tree. Only the R factors of O(log(blocks))
+    groups are kept while the blocks are processed, so `A` can be streamed.
+
+    Parameters
+    ----------
+
+    A : af.Array, numpy.ndarray / numpy.memmap or an iterable of row blocks.
+        The (m, n) matrix. The blocks of an iterable are af.Array or array like
+        objects accepted by af.to_array, all with n columns.
+
+    block_rows : optional: int. default: None.
+        The number of rows in each block, if `A` is an array. Defaults to max(8 * n, 1024).
+
+    return_q : optional: bool. default: False.
+        Also compute Q. The thin Q factors of all the blocks are kept on the device.
+
+    Returns
+    -------
+
+    R : af.Array
+        (n, n) upper triangular matrix, if `return_q` is False.
+
+    (Q, R) : tuple of af.Array
+        If `return_q` is True, where Q is (m, n) with orthonormal columns and A = Q * R.
+
+    Examples
+    --------
+
+    >>> import numpy as np
+    >>> import arrayfire as af
+    >>> A = np.memmap('features.f32', dtype=np.float32, mode='r', shape=(m, n))
+    >>> R = af.linalg.tsqr(A, block_rows=2**20)
+
+    Note
+    ----
+    The blocks are queued on the active device, which factorizes them
+    asynchronously while the next block is copied. If `return_q` is False,
+    the device memory used is bounded by a few blocks.
+
+    """
+    if block_rows is None:
+        n = A._dims4()[1] if isinstance(A, Array) else (A.shape[1] if hasattr(A, 'shape') else 0)
+        block_rows = max(8 * n, 1024)
+
+    stack = []
+    leaves = []
+    rows = 0
+    for start, block in _row_blocks(A, block_rows):
+        Q, R = _qr_factor(block, return_q)
+        leaf = _TSQRLeaf(start, Q)
+        node = _TSQRNode(0, R, [leaf] if return_q else [])
+        rows = start + block.dims()[0]
+        if return_q:
+            leaves.append(leaf)
+
+        # Merge groups of the same size, like a binary counter
+        while stack and stack[-1].level == node.level:
+            node = _tsqr_merge(stack.pop(), node, return_q)
+        stack.append(node)
+        _eval(node.R)
+
+    if not stack:
+        raise RuntimeError("No data was provided")
+
+    node = stack.pop()
+    while stack:
+        node = _tsqr_merge(stack.pop(), node, return_q)
+
+    if not return_q:
+        return node.R
+
+    Q = _constant(0, rows, node.R.dims()[0], dtype=node.R.dtype())
+    for leaf in leaves:
+        Q_leaf = leaf.Q if leaf.M is None else _matmul(leaf.Q, leaf.M)
+        Q[leaf.start:leaf.start + Q_leaf.dims()[0], :] = Q_leaf
+    return Q, node.R
@@ -0,0 +1,146 @@
+#######################################################
+# Copyright (c) 2015, ArrayFire
+# All rights reserved.
+#
+# This file is distributed under 3-clause BSD license.
+# The complete license agreement can be obtained at:
+# http://arrayfire.com/licenses/BSD-3-Clause
+########################################################
+
+"""
+Functions to distribute work across multiple devices.
+"""
+
+from .library import *
+from .array import *
+from .device import (get_device, set_device, get_device_count, sync, eval)
+import threading as _threading
+
+try:
+    import queue as _queue
+except ImportError:
+    import Queue as _queue
+
+def _get_devices(devices):
+    if devices is None:
+        try:
+            num = get_device_count()
+        except RuntimeError:
+            num = 0
+        return list(range(num)) if num > 0 else [0]
+    if isinstance(devices, int):
+        return list(range(devices))
+    return list(devices)
+
+def _eval_result(res):
+    if isinstance(res, Array):
+        eval(res)
+    elif isinstance(res, (tuple, list)):
+        for r in res:
+            if isinstance(r, Array):
+                eval(r)
+
+def _parallel_worker(dev, bk_name, func, tasks, results, errors):
+    try:
+        with backend_scope(bk_name, unsafe=True):
+            set_device(dev)
+            while True:
+                item = tasks.get()
+                if item is None:
+                    return
+                # Keep draining the queue after a failure so the producer never blocks
+                if errors:
+                    continue
+                idx, batch = item
+                res = func(batch)
+                _eval_result(res)
+                sync(dev)
+                results[idx] = res
+    except Exception as e:
+        errors.append(e)
+        while tasks.get() is not None:
+            pass
+
+def parallel_map(func, batches, devices=None):
+    """
+    Apply a function to a sequence of batches using one worker thread per device.
+
+    Parameters
+    ----------
+
+    func    : callable.
+            Function applied to each batch. It is called on the worker thread with the
+            worker's device set as the active device.
+
+    batches : iterable.
+            The inputs to `func`. Batches are handed out to the workers on demand,
+            so faster devices process more batches.
+
+    devices : optional: int or list of ints. default: None.
+            - If None, all the devices reported by `get_device_count()` are used.
+            - If int, the first `devices` devices are used.
+            - If list, the devices with the specified ids are used.
+
+    Returns
+    -------
+
+    out : list
+        `func(batch)` for each batch, in the same order as `batches`.
+
+    Note
+    ----
+
+    - Arrays returned by `func` are evaluated and synchronized on the worker's device.
+      They continue to live on that device.
+    - Host data (lists, numpy arrays) should be converted to `af.Array` inside `func`
+      so that it is copied to the worker's device.
+    - When only the active device is used (for example on the CPU backend), `func`
+      is called on the calling thread.
+    - The first exception raised by `func` is re-raised after all the workers stop.
+
+    Examples
+    --------
+
+    >>> import arrayfire as af
+    >>> res = af.parallel_map(lambda n: af.sum(af.randu(n)), [100, 200, 300])
+    """
+    devs = _get_devices(devices)
+
+    if (len(devs) == 1 and devs[0] == get_device()):
+        out = []
+        for batch in batches:
+            res = func(batch)
+            _eval_result(res)
+            out.append(res)
+        return out
+
+    bk_name = get_active_backend()
+    tasks = _queue.Queue(maxsize=2 * len(devs))
+    results = {}
+    errors = []
+
+    workers = [_threading.Thread(target=_parallel_worker,
+                                 args=(dev, bk_name, func, tasks, results, errors))
+               for dev in devs]
+
+    for worker in workers:
+        worker.daemon = True
+        worker.start()
+
+    num = 0
+    try:
+        for idx, batch in enumerate(batches):
+            if errors:
+                break
+            tasks.put((idx, batch))
+            num += 1
+    finally:
+        for worker in workers:
+            tasks.put(None)
+        for worker in workers:
+            worker.join()
+
+    if errors:
+        raise errors[0]
+
+    return [results[idx] for idx in range(num)]
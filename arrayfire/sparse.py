@@ -15,6 +15,22 @@ from .library import *
 from .array import *
 import numbers
 from .interop import to_array
+from .algorithm import accum as _accum
+from .algorithm import diff1 as _diff1
+from .algorithm import scan as _scan
+from .algorithm import sort_index as _sort_index
+from .algorithm import sum_by_key as _sum_by_key
+from .algorithm import min_by_key as _min_by_key
+from .algorithm import max_by_key as _max_by_key
+from .algorithm import count_by_key as _count_by_key
+from .algorithm import where as _where
+from .algorithm import _lookup, _run_flags
+from .data import flat as _flat
+from .data import join as _join
+from .data import moddims as _moddims
+from .data import select as _select
+from .arith import minof as _minof
+from .arith import maxof as _maxof
 
 __to_sparse_enum = [STORAGE.DENSE,
                     STORAGE.CSR,
@@ -276,3 +292,329 @@ def convert_sparse(sparse, storage):
     out = Array()
     safe_call(backend.get().af_sparse_convert_to(c_pointer(out.arr), sparse.arr, storage.value))
     return out
+
+def from_scipy(sp_mat):
+    """
+    Create a sparse matrix from a scipy.sparse matrix.
+
+    The values and indices are copied to the device in bulk, without going through python lists.
+
+    Parameters
+    ----------
+
+    sp_mat : scipy.sparse matrix.
+          - CSR and COO matrices keep their storage.
+          - Other formats are converted to CSR by scipy first.
+
+    Returns
+    -------
+
+    A sparse matrix.
+    """
+    import numpy as np
+
+    if sp_mat.format == 'coo':
+        storage = STORAGE.COO
+        row_idx = sp_mat.row
+        col_idx = sp_mat.col
+    else:
+        if sp_mat.format != 'csr':
+            sp_mat = sp_mat.tocsr()
+        storage = STORAGE.CSR
+        row_idx = sp_mat.indptr
+        col_idx = sp_mat.indices
+
+    nrows, ncols = sp_mat.shape
+    if max(nrows, ncols, sp_mat.nnz) > np.iinfo(np.int32).max:
+        raise RuntimeError("Sparse matrix is too large for 32 bit indices")
+
+    # Only copies if scipy is using 64 bit indices or a non contiguous buffer
+    values = np.ascontiguousarray(sp_mat.data)
+    row_idx = np.ascontiguousarray(row_idx, dtype=np.int32)
+    col_idx = np.ascontiguousarray(col_idx, dtype=np.int32)
+
+    return create_sparse(to_array(values), to_array(row_idx), to_array(col_idx),
+                         nrows, ncols, storage)
+
+def to_scipy(sparse):
+    """
+    Create a scipy.sparse matrix from a sparse matrix.
+
+    The values and indices are copied to the host in bulk, without going through python lists.
+
+    Parameters
+    ----------
+
+    sparse : af.Array.
+           - A sparse matrix.
+
+    Returns
+    -------
+
+    scipy.sparse.csr_matrix, scipy.sparse.csc_matrix or scipy.sparse.coo_matrix
+    depending on the storage of `sparse`. The index arrays are int32.
+    """
+    from scipy import sparse as sp
+
+    values, row_idx, col_idx, storage = sparse_get_info(sparse)
+    shape = sparse._dims4()[:2]
+    values = values.to_ndarray()
+    row_idx = row_idx.to_ndarray()
+    col_idx = col_idx.to_ndarray()
+
+    if storage == STORAGE.CSR:
+        return sp.csr_matrix((values, col_idx, row_idx), shape=shape)
+    elif storage == STORAGE.CSC:
+        return sp.csc_matrix((values, row_idx, col_idx), shape=shape)
+    elif storage == STORAGE.COO:
+        return sp.coo_matrix((values, (row_idx, col_idx)), shape=shape)
+    else:
+        raise RuntimeError("Input is not a sparse matrix")
+
+def assemble(values, row_idx, col_idx, nrows, ncols, storage = STORAGE.CSR):
+    """
+    Create a sparse matrix from triplets that may contain duplicate entries.
+
+    The triplets are sorted by (row, column) and the values of duplicate entries
+    are added together, without copying anything to the host.
+
+    Parameters
+    ----------
+
+    values : Any datatype that can be converted to array.
+          - Contains the values of the triplets.
+
+    row_idx : Any datatype that can be converted to array.
+          - Contains the row indices of the triplets.
+
+    col_idx : Any datatype that can be converted to array.
+          - Contains the column indices of the triplets.
+
+    nrows   : int.
+          - specifies the number of rows in sparse matrix.
+
+    ncols   : int.
+          - specifies the number of columns in sparse matrix.
+
+    storage : optional: arrayfire.STORAGE. default: arrayfire.STORAGE.CSR.
+          - Can be one of arrayfire.STORAGE.CSR, arrayfire.STORAGE.COO.
+
+    Returns
+    -------
+
+    A sparse matrix with sorted, unique (row, column) entries.
+    """
+    if storage != STORAGE.CSR and storage != STORAGE.COO:
+        raise RuntimeError("storage must be arrayfire.STORAGE.CSR or arrayfire.STORAGE.COO")
+
+    values = _flat(to_array(values))
+    rows = _flat(to_array(row_idx)).as_type(Dtype.s64)
+    cols = _flat(to_array(col_idx)).as_type(Dtype.s64)
+
+    # Sort by the linear index of every entry, then add up each run of equal indices
+    lin_idx, perm = _sort_index(rows * ncols + cols)
+    ids = _scan(_run_flags(lin_idx, False).as_type(Dtype.u32))
+    values = _sum_by_key(ids, _lookup(values, perm, 0), is_sorted=True)[1]
+
+    lin_idx = _lookup(lin_idx, _where(_run_flags(lin_idx, True)), 0)
+    rows = lin_idx / ncols
+    cols = (lin_idx - rows * ncols).as_type(Dtype.s32)
+    rows = rows.as_type(Dtype.s32)
+
+    if storage == STORAGE.COO:
+        return create_sparse(values, rows, cols, nrows, ncols, storage)
+
+    # Offsets of each row: scatter the number of entries of every non empty row, then accumulate
+    row_start = _where(_run_flags(rows, True))
+    end = Array()
+    end.arr = constant_array(values.elements(), 1, 1, 1, 1, Dtype.u32)
+    row_counts = _diff1(_join(0, row_start, end))
+
+    counts = Array()
+    counts.arr = constant_array(0, nrows + 1, 1, 1, 1, Dtype.u32)
+    counts[_lookup(rows, row_start, 0) + 1] = row_counts
+    offsets = _accum(counts).as_type(Dtype.s32)
+
+    return create_sparse(values, offsets, cols, nrows, ncols, storage)
+
+def _coo_info(sparse):
+    if sparse_get_storage(sparse) != STORAGE.COO:
+        sparse = convert_sparse(sparse, STORAGE.COO)
+    values, row_idx, col_idx, storage = sparse_get_info(sparse)
+    return values, row_idx, col_idx
+
+def _from_coo(values, row_idx, col_idx, like):
+    nrows, ncols = like._dims4()[:2]
+    out = create_sparse(values, row_idx, col_idx, nrows, ncols, STORAGE.COO)
+    storage = sparse_get_storage(like)
+    return out if storage == STORAGE.COO else convert_sparse(out, storage)
+
+def _with_values(sparse, values):
+    nrows, ncols = sparse._dims4()[:2]
+    _, row_idx, col_idx, storage = sparse_get_info(sparse)
+    return create_sparse(values, row_idx, col_idx, nrows, ncols, storage)
+
+def sparse_scale(sparse, alpha):
+    """
+    Multiply every element of a sparse matrix by a scalar.
+
+    Parameters
+    ----------
+
+    sparse : af.Array.
+           - A sparse matrix.
+
+    alpha  : scalar.
+
+    Returns
+    -------
+
+    A sparse matrix with the same storage and sparsity pattern.
+    """
+    return _with_values(sparse, sparse_get_values(sparse) * alpha)
+
+def sparse_apply(sparse, func):
+    """
+    Apply an element wise function to the non zero elements of a sparse matrix.
+
+    Parameters
+    ----------
+
+    sparse : af.Array.
+           - A sparse matrix.
+
+    func   : callable.
+           - Takes and returns an af.Array. Must map zero to zero (for example af.sin or af.abs),
+             because it is not applied to the elements that are not stored.
+
+    Returns
+    -------
+
+    A sparse matrix with the same storage and sparsity pattern.
+    """
+    return _with_values(sparse, func(sparse_get_values(sparse)))
+
+def sparse_scale_rows(sparse, scales):
+    """
+    Multiply every row of a sparse matrix by a scalar, i.e. diag(scales) * sparse.
+
+    Parameters
+    ----------
+
+    sparse : af.Array.
+           - A sparse matrix.
+
+    scales : af.Array.
+           - A vector with one element for each row.
+
+    Returns
+    -------
+
+    A sparse matrix with the same storage and sparsity pattern.
+    """
+    values, row_idx, col_idx = _coo_info(sparse)
+    return _from_coo(values * _lookup(_flat(scales), row_idx, 0), row_idx, col_idx, sparse)
+
+def sparse_scale_cols(sparse, scales):
+    """
+    Multiply every column of a sparse matrix by a scalar, i.e. sparse * diag(scales).
+
+    Parameters
+    ----------
+
+    sparse : af.Array.
+           - A sparse matrix.
+
+    scales : af.Array.
+           - A vector with one element for each column.
+
+    Returns
+    -------
+
+    A sparse matrix with the same storage and sparsity pattern.
+    """
+    values, row_idx, col_idx = _coo_info(sparse)
+    return _from_coo(values * _lookup(_flat(scales), col_idx, 0), row_idx, col_idx, sparse)
+
+def sparse_add(lhs, rhs):
+    """
+    Add a sparse matrix to a sparse or a dense matrix.
+
+    Parameters
+    ----------
+
+    lhs : af.Array.
+        - A sparse matrix.
+
+    rhs : af.Array.
+        - A sparse or dense matrix of the same size.
+
+    Returns
+    -------
+
+    - If `rhs` is sparse, a sparse matrix whose sparsity pattern is the union of both patterns.
+      The storage is CSR unless both inputs are COO.
+    - If `rhs` is dense, a dense matrix. `lhs` is never converted to dense.
+    """
+    nrows, ncols = lhs._dims4()[:2]
+    if rhs._dims4()[:2] != (nrows, ncols):
+        raise RuntimeError("The matrices must have the same size")
+
+    values, row_idx, col_idx = _coo_info(lhs)
+
+    if rhs.is_sparse():
+        rhs_values, rhs_row_idx, rhs_col_idx = _coo_info(rhs)
+        storage = STORAGE.COO
+        if sparse_get_storage(lhs) != STORAGE.COO or sparse_get_storage(rhs) != STORAGE.COO:
+            storage = STORAGE.CSR
+        return assemble(_join(0, values, rhs_values), _join(0, row_idx, rhs_row_idx),
+                        _join(0, col_idx, rhs_col_idx), nrows, ncols, storage)
+
+    # The stored entries are unique, so a gather and a scatter of the linear indices is enough
+    lin_idx = row_idx.as_type(Dtype.s64) + col_idx.as_type(Dtype.s64) * nrows
+    out = _flat(rhs)
+    out[lin_idx] = out[lin_idx] + values
+    return _moddims(out, nrows, ncols)
+
+def sparse_reduce_rows(sparse, op='sum'):
+    """
+    Reduce every row of a sparse matrix.
+
+    Parameters
+    ----------
+
+    sparse : af.Array.
+           - A sparse matrix.
+
+    op     : optional: str. default: 'sum'.
+           - One of 'sum', 'min', 'max' or 'count' (the number of non zero elements).
+             The elements that are not stored count as zeros.
+
+    Returns
+    -------
+
+    A dense column vector with one element for each row.
+    """
+    reducers = {'sum' : _sum_by_key, 'min' : _min_by_key, 'max' : _max_by_key, 'count' : _count_by_key}
+    if op not in reducers:
+        raise RuntimeError("Unsupported reduction: %s" % op)
+
+    nrows, ncols = sparse._dims4()[:2]
+    values, row_idx, col_idx = _coo_info(sparse)
+    keys, reduced = reducers[op](row_idx, values)
+
+    out = Array()
+    out.arr = constant_array(0, nrows, 1, 1, 1, reduced.type())
+    out[keys] = reduced
+
+    if op == 'min' or op == 'max':
+        # Rows that are not full also contain zeros
+        ones = Array()
+        ones.arr = constant_array(1, values.elements(), 1, 1, 1, Dtype.u32)
+        stored = Array()
+        stored.arr = constant_array(0, nrows, 1, 1, 1, Dtype.u32)
+        stored[keys] = _sum_by_key(row_idx, ones)[1]
+        with_zero = _minof(out, 0) if op == 'min' else _maxof(out, 0)
+        out = _select(stored == ncols, out, with_zero)
+
+    return out
@@ -13,6 +13,15 @@ Statistical algorithms (mean, var, stdev, etc).
 
 from .library import *
 from .array import *
+from .algorithm import sum as _sum
+from .algorithm import product as _product
+from .algorithm import min as _min
+from .algorithm import max as _max
+from .algorithm import count as _count
+from .arith import abs as _abs
+from .arith import cast as _cast
+from .arith import sqrt as _sqrt
+from .device import is_dbl_supported as _is_dbl_supported
 
 def mean(a, weights=None, dim=None):
     """
@@ -262,3 +271,156 @@ def topk(data, k, dim=0, order=TOPK.DEFAULT):
     safe_call(backend.get().af_topk(c_pointer(values.arr), c_pointer(indices.arr), data.arr, k, c_int_t(dim), order.value))
 
     return values,indices
+
+_reductions = ('sum', 'product', 'min', 'max', 'count', 'mean', 'var', 'stdev')
+
+def _to_host(values):
+    """
+    Copy a list of 1 element arrays to the host with a single transfer.
+    """
+    is_complex = any(val.is_complex() for val in values)
+    if _is_dbl_supported():
+        dtype = Dtype.c64 if is_complex else Dtype.f64
+    else:
+        dtype = Dtype.c32 if is_complex else Dtype.f32
+
+    num = len(values)
+    c_arrs = (c_void_ptr_t * num)()
+    casted = [_cast(val, dtype) for val in values]
+    for n in range(num):
+        c_arrs[n] = casted[n].arr
+
+    joined = Array()
+    safe_call(backend.get().af_join_many(c_pointer(joined.arr), 0, num, c_pointer(c_arrs)))
+
+    res = (to_c_type[dtype.value] * num)()
+    safe_call(backend.get().af_get_data_ptr(c_pointer(res), joined.arr))
+
+    if is_complex:
+        return [complex(val[0], val[1]) for val in res]
+    return list(res)
+
+def reduce_many(a, ops=('sum', 'min', 'max', 'count', 'mean', 'var'), dim=None, isbiased=False):
+    """
+    Calculate several reductions of an array together.
+
+    Parameters
+    ----------
+    a: af.Array
+        The input array.
+
+    ops: optional: tuple of str. default: ('sum', 'min', 'max', 'count', 'mean', 'var').
+        The reductions to calculate. Can contain 'sum', 'product', 'min',
+        'max', 'count', 'mean', 'var' and 'stdev'.
+
+    dim: optional: int. default: None.
+        The dimension along which the reductions are calculated.
+        If None, the reductions are over all the elements of `a`.
+
+    isbiased: optional: Boolean. default: False.
+        Used by 'var' and 'stdev'. If True, the sum of squared deviations is
+        divided by the number of elements, else by the number of elements - 1.
+
+    Returns
+    -------
+    output: dict
+        Maps each name in `ops` to its result.
+        - If `dim` is None, the results are python numbers.
+        - Otherwise, the results are af.Array.
+
+    Note
+    ----
+    - The reductions are queued on the device without waiting for each other.
+      'sum', 'mean', 'var' and 'stdev' share the same sum of the elements.
+    - 'mean', 'var' and 'stdev' of integer arrays are calculated in floating point.
+    - If `dim` is None, all the results are copied to the host in a single transfer.
+    - 'count' is the number of non zero elements, as in af.count.
+    """
+    for op in ops:
+        if op not in _reductions:
+            raise RuntimeError("Invalid reduction: " + str(op))
+
+    if dim is None:
+        num = a.elements()
+        kwargs = dict(lazy=True)
+    else:
+        num = a._dims4()[dim]
+        kwargs = dict(dim=dim)
+
+    res = {}
+    total = None
+    mean = None
+    var = None
+
+    moments = any(op in ('mean', 'var', 'stdev') for op in ops)
+
+    # Integer inputs are cast so that the moments match af.mean and af.var
+    fa = a
+    if moments and not a.is_floating():
+        fa = _cast(a, Dtype.f64 if _is_dbl_supported() else Dtype.f32)
+
+    if 'sum' in ops or (moments and fa is a):
+        total = _sum(a, **kwargs)
+    if moments:
+        mean = (total if fa is a else _sum(fa, **kwargs)) / num
+    if any(op in ('var', 'stdev') for op in ops):
+        diff = fa - mean
+        sqr = _abs(diff) * _abs(diff) if diff.is_complex() else diff * diff
+        var = _sum(sqr, **kwargs) / (num if isbiased else num - 1)
+
+    for op in ops:
+        if op == 'sum':
+            res[op] = total
+        elif op == 'product':
+            res[op] = _product(a, **kwargs)
+        elif op == 'min':
+            res[op] = _min(a, **kwargs)
+        elif op == 'max':
+            res[op] = _max(a, **kwargs)
+        elif op == 'count':
+            res[op] = _count(a, **kwargs)
+        elif op == 'mean':
+            res[op] = mean
+        elif op == 'var':
+            res[op] = var
+        elif op == 'stdev':
+            res[op] = _sqrt(var)
+
+    if dim is not None:
+        return res
+
+    names = list(res.keys())
+    values = _to_host([res[name] for name in names])
+    for name, val in zip(names, values):
+        if name == 'count':
+            val = int(val.real)
+        elif isinstance(val, complex) and val.imag == 0:
+            val = val.real
+        res[name] = val
+    return res
+
+def describe(a, dim=None, isbiased=False):
+    """
+    Calculate the summary statistics of an array.
+
+    Parameters
+    ----------
+    a: af.Array
+        The input array.
+
+    dim: optional: int. default: None.
+        The dimension along which the statistics are calculated.
+        If None, the statistics are over all the elements of `a`.
+
+    isbiased: optional: Boolean. default: False.
+        Used by 'var' and 'stdev'. See `reduce_many`.
+
+    Returns
+    -------
+    output: dict
+        Contains 'elements' (number of elements reduced), 'mean', 'var',
+        'stdev', 'min' and 'max'. See `reduce_many`.
+    """
+    res = reduce_many(a, ('mean', 'var', 'stdev', 'min', 'max'), dim, isbiased)
+    res['elements'] = a.elements() if dim is None else a._dims4()[dim]
+    return res
@@ -0,0 +1,226 @@
+#######################################################
+# Copyright (c) 2015, ArrayFire
+# All rights reserved.
+#
+# This file is distributed under 3-clause BSD license.
+# The complete license agreement can be obtained at:
+# http://arrayfire.com/licenses/BSD-3-Clause
+########################################################
+
+"""
+Statistics accumulated over a stream of batches.
+
+    >>> import arrayfire as af
+    >>> acc = af.stats.Running(dim=0)
+    >>> for batch in batches:
+    ...     acc.update(batch)
+    >>> af.display(acc.var())
+
+"""
+
+from .library import *
+from .array import *
+from .array import _to_device_scalar
+from .algorithm import min as _min
+from .algorithm import max as _max
+from .arith import minof as _minof
+from .arith import maxof as _maxof
+from .arith import sqrt as _sqrt
+from .blas import matmulTN as _matmulTN
+from .blas import matmulNT as _matmulNT
+from .data import flat as _flat
+from .statistics import mean as _mean
+from .statistics import var as _var
+
+class Running(object):
+    """
+    Running count, mean, variance, minimum, maximum and (optionally) covariance.
+
+    The state is kept on the device and updated with the formulas of Welford and
+    Chan et al., so the results are as accurate as computing them over all the
+    data at once, and two accumulators can be merged.
+
+    Parameters
+    ----------
+
+    dim : optional: int. default: None.
+        The dimension along which the samples are laid out in each batch.
+        - If None, every element of a batch is a sample. The results are af.DeviceScalar.
+        - Otherwise, the results are af.Array with size 1 along `dim`.
+
+    cov : optional: bool. default: False.
+        Also accumulate the covariance matrix. Requires `dim` to be 0 or 1 and
+        2 dimensional batches. If `dim` is 0, the rows are the samples and the columns
+        are the variables. If `dim` is 1, the columns are the samples.
+
+    Note
+    ----
+
+    - `update` and `merge` do not synchronize with the device.
+    - To merge accumulators from different devices, the arrays of `other` must be
+      usable on the active device.
+    """
+
+    def __init__(self, dim=None, cov=False):
+        if cov and dim not in (0, 1):
+            raise RuntimeError("cov requires dim to be 0 or 1")
+
+        self.dim = dim
+        self.has_cov = cov
+        self.count = 0
+        self._mean = None
+        self._m2 = None
+        self._min = None
+        self._max = None
+        self._comoment = None
+
+    def _wrap(self, arr):
+        return _to_device_scalar(arr) if self.dim is None else arr
+
+    def update(self, batch):
+        """
+        Add a batch of samples.
+
+        Parameters
+        ----------
+
+        batch : af.Array
+            The new samples.
+
+        Returns
+        -------
+
+        self : Running
+        """
+        dim = self.dim
+        if dim is None:
+            batch = _flat(batch)
+            dim = 0
+
+        other = Running(self.dim, self.has_cov)
+        other.count = batch._dims4()[dim]
+        if other.count == 0:
+            return self
+
+        other._mean = self._wrap(_mean(batch, dim=dim))
+        other._m2 = self._wrap(_var(batch, isbiased=True, dim=dim) * other.count)
+        other._min = self._wrap(_min(batch, dim))
+        other._max = self._wrap(_max(batch, dim))
+
+        if self.has_cov:
+            diff = batch - other._mean
+            if dim == 0:
+                other._comoment = _matmulTN(diff, diff)
+            else:
+                other._comoment = _matmulNT(diff, diff)
+
+        return self.merge(other)
+
+    def merge(self, other):
+        """
+        Add the samples accumulated by another Running accumulator.
+
+        Parameters
+        ----------
+
+        other : Running
+            Must have the same `dim` and `cov` settings.
+
+        Returns
+        -------
+
+        self : Running
+        """
+        if other.dim != self.dim or other.has_cov != self.has_cov:
+            raise RuntimeError("Can not merge accumulators with different settings")
+
+        if other.count == 0:
+            return self
+
+        if self.count == 0:
+            self.count = other.count
+            self._mean = other._mean
+            self._m2 = other._m2
+            self._min = other._min
+            self._max = other._max
+            self._comoment = other._comoment
+            return self
+
+        na = self.count
+        nb = other.count
+        num = na + nb
+
+        delta = other._mean - self._mean
+        self._mean = self._mean + delta * (float(nb) / num)
+        self._m2 = self._m2 + other._m2 + delta * delta * (float(na) * nb / num)
+        self._min = self._wrap(_minof(self._min, other._min))
+        self._max = self._wrap(_maxof(self._max, other._max))
+
+        if self.has_cov:
+            if self.dim == 0:
+                outer = _matmulTN(delta, delta)
+            else:
+                outer = _matmulNT(delta, delta)
+            self._comoment = self._comoment + other._comoment + outer * (float(na) * nb / num)
+
+        self.count = num
+        return self
+
+    def _check(self):
+        if self.count == 0:
+            raise RuntimeError("No samples have been added")
+
+    def mean(self):
+        """
+        Mean of the samples.
+        """
+        self._check()
+        return self._mean
+
+    def var(self, isbiased=False):
+        """
+        Variance of the samples.
+
+        Parameters
+        ----------
+
+        isbiased : optional: bool. default: False.
+            If True, divide by the number of samples, else by the number of samples - 1.
+        """
+        self._check()
+        return self._m2 / (self.count if isbiased else self.count - 1)
+
+    def stdev(self, isbiased=False):
+        """
+        Standard deviation of the samples. See `var`.
+        """
+        return self._wrap(_sqrt(self.var(isbiased)))
+
+    def min(self):
+        """
+        Minimum of the samples.
+        """
+        self._check()
+        return self._min
+
+    def max(self):
+        """
+        Maximum of the samples.
+        """
+        self._check()
+        return self._max
+
+    def cov(self, isbiased=False):
+        """
+        Covariance matrix of the variables. Only available if created with `cov=True`.
+
+        Parameters
+        ----------
+
+        isbiased : optional: bool. default: False.
+            If True, divide by the number of samples, else by the number of samples - 1.
+        """
+        if not self.has_cov:
+            raise RuntimeError("Covariance is not being accumulated")
+        self._check()
+        return self._comoment / (self.count if isbiased else self.count - 1)
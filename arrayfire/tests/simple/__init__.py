@@ -7,18 +7,24 @@
 # http://arrayfire.com/licenses/BSD-3-Clause
 ########################################################
 
+from .aio import *
 from .algorithm import *
 from .arith import *
 from .array_test import *
 from .blas import *
 from .data import *
 from .device import *
+from .external import *
 from .image import *
 from .index import *
 from .interop import *
 from .lapack import *
+from .linalg import *
 from .signal import *
 from .statistics import *
+from .stats import *
 from .random import *
 from .sparse import *
+from .parallel import *
+from .trace import *
 from ._util import tests
@@ -0,0 +1,57 @@
+#!/usr/bin/python
+#######################################################
+# Copyright (c) 2015, ArrayFire
+# All rights reserved.
+#
+# This file is distributed under 3-clause BSD license.
+# The complete license agreement can be obtained at:
+# http://arrayfire.com/licenses/BSD-3-Clause
+########################################################
+
+import arrayfire as af
+from . import _util
+
+def simple_aio(verbose=False):
+    display_func = _util.display_func(verbose)
+    print_func   = _util.print_func(verbose)
+
+    try:
+        import asyncio
+    except ImportError:
+        return
+
+    a = af.constant(2, 3, 3)
+    b = a + a
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    def run(func, *args):
+        # The awaitables are created inside the running loop, as they would be in a coroutine
+        res = loop.create_future()
+        def start():
+            try:
+                fut = func(*args)
+            except Exception as e:
+                res.set_exception(e)
+                return
+            fut.add_done_callback(lambda f: res.set_exception(f.exception()) if f.exception()
+                                  else res.set_result(f.result()))
+        loop.call_soon(start)
+        return loop.run_until_complete(res)
+
+    try:
+        run(af.aio.eval, b)
+        run(af.aio.sync)
+        val = run(af.aio.scalar, b)
+        assert(val == 4)
+        lst = run(af.aio.to_list, b)
+        print_func(lst)
+        if af.AF_NUMPY_FOUND:
+            n = run(af.aio.to_ndarray, b)
+            assert((n == 4).all())
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+_util.tests['aio'] = simple_aio
@@ -52,6 +52,35 @@ def simple_algorithm(verbose = False):
     display_func(af.scan_by_key(k, a, 0, af.BINARYOP.ADD))
     display_func(af.scan_by_key(k, a, 1, af.BINARYOP.MAX))
 
+    keys = af.constant(0, 3, dtype=af.Dtype.s32)
+    keys[1:] = 1
+    for by_key in (af.sum_by_key, af.product_by_key, af.min_by_key, af.max_by_key, af.count_by_key):
+        ko, vo = by_key(keys, a, 0, is_sorted=True)
+        display_func(ko)
+        display_func(vo)
+        ko, vo = by_key(keys, a, 1)
+        display_func(ko)
+        display_func(vo)
+
+    keys = af.Array([2, 0, 2, 1, 0]).as_type(af.Dtype.s32)
+    vals = af.Array([1, 2, 3, 4, 0])
+    expected = {af.sum_by_key : [2, 4, 4], af.product_by_key : [0, 4, 3],
+                af.min_by_key : [0, 4, 1], af.max_by_key : [2, 4, 3], af.count_by_key : [1, 1, 2]}
+    for by_key, ref in expected.items():
+        ko, vo = by_key(keys, vals)
+        assert(af.all_true(ko == af.Array([0, 1, 2])))
+        assert(af.max(af.abs(vo - af.Array(ref))) == 0)
+
+    c = af.round(5 * af.randu(10))
+    u, index, inverse, counts = af.unique(c, return_index=True, return_inverse=True, return_counts=True)
+    display_func(u)
+    display_func(index)
+    display_func(inverse)
+    display_func(counts)
+    assert(af.max(af.abs(af.lookup(u, inverse) - c)) == 0)
+    assert(af.max(af.abs(af.lookup(c, index) - u)) == 0)
+    assert(af.sum(counts) == 10)
+
     display_func(af.sort(a, is_ascending=True))
     display_func(af.sort(a, is_ascending=False))
 
@@ -90,4 +119,16 @@ def simple_algorithm(verbose = False):
     display_func(af.set_intersect(cc, cc, is_unique=True))
     display_func(af.set_intersect(cc, cc, is_unique=False))
 
+    s = af.sum(a, lazy=True)
+    assert(isinstance(s, af.DeviceScalar))
+    assert(abs(float(s) - af.sum(a)) < 1E-3)
+    m = af.max(a, lazy=True) - af.min(a, lazy=True)
+    assert(isinstance(m, af.DeviceScalar))
+    assert(abs(float(m) - (af.max(a) - af.min(a))) < 1E-5)
+    display_func(a / s)
+    print_func('%.4f' % af.product(a, lazy=True))
+    assert(int(af.count(a, lazy=True)) == af.count(a))
+    assert(bool(af.any_true(a > 0.5, lazy=True)) == bool(af.any_true(a > 0.5)))
+    print_func(float(af.sum(d, nan_val=0.0, lazy=True)))
+
 _util.tests['algorithm'] = simple_algorithm
@@ -216,4 +216,17 @@ def simple_arith(verbose = False):
 
     display_func(test_add(a, b))
 
+    with af.broadcasting():
+        display_func(a + b)
+
+    c = a + b
+    assert(c.dims() == (5, 5))
+    display_func(c)
+    display_func(a * af.randu(5, 3))
+    display_func(af.minof(b, af.randu(2, 5)))
+    display_func(af.clamp(af.randu(5, 5), a * 0.25, b * 0.75 + 0.25))
+
+    s = af.sum(a, 0)
+    display_func(s * a)
+
 _util.tests['arith'] = simple_arith
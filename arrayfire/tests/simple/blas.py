@@ -23,5 +23,21 @@ def simple_blas(verbose=False):
 
     b = af.randu(5,1)
     display_func(af.dot(b,b))
+    print_func(float(af.dot(b, b, return_scalar=True, lazy=True)))
+
+    a = af.randu(20, 3)
+    b = af.randu(20, 30)
+    c = af.randu(30, 2)
+    res = af.multi_dot([(a, af.MATPROP.TRANS), b, c])
+    display_func(res)
+    assert(af.max(af.abs(res - af.matmul(af.matmulTN(a, b), c))) < 1E-3)
+
+    x = af.randu(3, 4, 2)
+    y = af.randu(4, 5, 2)
+    res = af.einsum('ijb,jkb->ikb', x, y)
+    display_func(res)
+    assert(af.max(af.abs(res[:, :, 1] - af.matmul(x[:, :, 1], y[:, :, 1]))) < 1E-4)
+    assert(af.max(af.abs(af.einsum('ij,ij->i', b, b) - af.sum(b * b, 1))) < 1E-3)
+    assert(af.max(af.abs(af.einsum('ij->ji', b) - b.T)) == 0)
 
 _util.tests['blas'] = simple_blas
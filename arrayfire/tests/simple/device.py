@@ -40,6 +40,21 @@ def simple_device(verbose=False):
 
     af.set_device(curr_dev)
 
+    for k in range(af.get_device_count()):
+        with af.device_scope(k):
+            assert(k == af.get_device())
+        assert(curr_dev == af.get_device())
+
+    with af.backend_scope(af.get_active_backend()):
+        display_func(af.randu(3, 3))
+
+    try:
+        with af.backend_scope('invalid'):
+            pass
+        assert(False)
+    except RuntimeError:
+        pass
+
     a = af.randu(10,10)
     display_func(a)
     dev_ptr = af.get_device_ptr(a)
@@ -0,0 +1,53 @@
+#!/usr/bin/python
+#######################################################
+# Copyright (c) 2015, ArrayFire
+# All rights reserved.
+#
+# This file is distributed under 3-clause BSD license.
+# The complete license agreement can be obtained at:
+# http://arrayfire.com/licenses/BSD-3-Clause
+########################################################
+
+import arrayfire as af
+from . import _util
+
+def simple_external(verbose=False):
+    display_func = _util.display_func(verbose)
+    print_func   = _util.print_func(verbose)
+
+    chunks = [af.randu(10), af.randu(7), af.randu(12)]
+    a = af.join(0, chunks[0], chunks[1], chunks[2])
+
+    vals, idx = af.external.topk(chunks, 5)
+    display_func(vals)
+    display_func(idx)
+    ref_vals, ref_idx = af.topk(a, 5)
+    assert(af.max(af.abs(vals - ref_vals)) == 0)
+    assert(af.max(af.abs(af.lookup(a, idx) - vals)) == 0)
+
+    if af.AF_NUMPY_FOUND:
+        import numpy as np
+        n = a.to_ndarray()
+
+        out = af.external.sort(n, chunk_size=8)
+        print_func(out)
+        assert((out == np.sort(n)).all())
+
+        out = af.external.sort(chunks, is_ascending=False, block_size=2)
+        assert((out == np.sort(n)[::-1]).all())
+
+        out, out_idx = af.external.sort_index(n, chunk_size=8)
+        assert((n[out_idx] == out).all())
+
+        keys = np.arange(29, dtype=np.int32)[::-1].copy()
+        out_keys, out_vals = af.external.sort_by_key(keys, n, chunk_size=8)
+        assert((out_keys == np.arange(29)).all())
+        assert((out_vals == n[::-1]).all())
+
+        m = np.random.random((6, 5)).astype(np.float32)
+        out, out_idx = af.external.sort_index(m, chunk_size=2)
+        assert((m.reshape(-1)[out_idx] == out).all())
+        vals, idx = af.external.topk(m, 4, chunk_size=2)
+        assert((m.reshape(-1)[idx.to_ndarray()] == vals.to_ndarray()).all())
+
+_util.tests['external'] = simple_external
@@ -136,4 +136,10 @@ def simple_interop(verbose = False):
         n2 = np.array(a)
         assert((n==n2).all())
 
+    # Lazily loaded names must resolve to the module they are listed under
+    import importlib
+    for name, mod in af._lazy_attrs.items():
+        mod = importlib.import_module('arrayfire.' + mod)
+        assert(getattr(af, name) is getattr(mod, name))
+
 _util.tests['interop'] = simple_interop
@@ -81,4 +81,35 @@ def simple_lapack(verbose=False):
     u,s,vt = af.svd_inplace(a)
     display_func(af.matmul(af.matmul(u, af.diag(s, 0, False)), vt))
 
+    # 3 runs the elimination on the whole batch, 20 the loop over the matrices
+    for n in (3, 20):
+        a = af.randu(n, n, 4) + n * af.identity(n, n, 4)
+        b = af.randu(n, 2, 4)
+        x = af.solve_batched(a, b)
+        ai = af.inverse_batched(a)
+        d = af.det_batched(a)
+        l, u, p = af.lu_batched(a)
+        spd = a + af.reorder(a, 1, 0, 2)
+        r, info = af.cholesky_batched(spd)
+        display_func(x)
+        display_func(d)
+        print_func(info)
+        for i in range(4):
+            ai_i = af.inverse(a[:, :, i])
+            assert(af.max(af.abs(x[:, :, i] - af.solve(a[:, :, i], b[:, :, i]))) < 1E-3)
+            assert(af.max(af.abs(ai[:, :, i] - ai_i)) < 1E-3)
+            assert(abs(d[0, 0, i].scalar() - af.det(a[:, :, i])) < 1E-3 * abs(af.det(a[:, :, i])))
+            assert(af.max(af.abs(af.matmul(l[:, :, i], u[:, :, i]) - a[:, :, i][p[:, :, i], :])) < 1E-3)
+            assert(af.max(af.abs(af.matmulTN(r[:, :, i], r[:, :, i]) - spd[:, :, i])) < 1E-3)
+        assert(af.max(info) == 0)
+
+    a = af.randu(3, 3, 2) + 3 * af.identity(3, 3, 2)
+    a[:, 0, 1] = 0
+    d = af.det_batched(a)
+    l, u, p = af.lu_batched(a)
+    display_func(d)
+    assert(d[0, 0, 1].scalar() == 0)
+    assert(abs(d[0, 0, 0].scalar() - af.det(a[:, :, 0])) < 1E-3 * abs(af.det(a[:, :, 0])))
+    assert(af.max(af.abs(af.matmul(l[:, :, 1], u[:, :, 1]) - a[:, :, 1][p[:, :, 1], :])) < 1E-3)
+
 _util.tests['lapack'] = simple_lapack
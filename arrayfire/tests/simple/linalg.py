@@ -0,0 +1,101 @@
+#!/usr/bin/python
+#######################################################
+# Copyright (c) 2015, ArrayFire
+# All rights reserved.
+#
+# This file is distributed under 3-clause BSD license.
+# The complete license agreement can be obtained at:
+# http://arrayfire.com/licenses/BSD-3-Clause
+########################################################
+
+import arrayfire as af
+from . import _util
+
+def simple_linalg(verbose=False):
+    display_func = _util.display_func(verbose)
+    print_func   = _util.print_func(verbose)
+
+    n = 20
+    r = af.randu(n, n)
+    A = af.matmulNT(r, r) + n * af.identity(n, n)
+    b = af.randu(n)
+    As = af.sparse.create_sparse_from_dense(A)
+
+    for solver in (af.linalg.cg, af.linalg.bicgstab, af.linalg.gmres):
+        for mat in (A, As):
+            x, info = solver(mat, b, tol=1E-6, M=af.linalg.jacobi(mat))
+            display_func(x)
+            print_func(info)
+            assert(info == 0)
+            assert(af.norm(af.matmul(A, x) - b) <= 1E-4 * af.norm(b))
+
+    x, info = af.linalg.cg(lambda v: af.matmul(A, v), b, tol=1E-6, check_every=1)
+    assert(info == 0)
+
+    zero = af.constant(0, n)
+    for solver in (af.linalg.cg, af.linalg.bicgstab, af.linalg.gmres):
+        x, info = solver(A, zero)
+        assert(info == 0)
+        assert(af.max(af.abs(x)) == 0)
+
+    B = af.randu(n, 3)
+    for kind in ('lu', 'cholesky', 'qr'):
+        fact = af.linalg.factorize(A, kind)
+        X = fact.solve(B)
+        display_func(X)
+        assert(af.max(af.abs(af.matmul(A, X) - B)) < 1E-3)
+        assert(af.max(af.abs(af.matmul(A, fact.inverse()) - af.identity(n, n))) < 1E-3)
+        print_func(fact.logdet())
+
+    cache = af.linalg.FactorCache(maxsize=1)
+    fact = af.linalg.factorize(A, cache=cache)
+    assert(af.linalg.factorize(A, cache=cache) is fact)
+    af.linalg.factorize(B[:3, :3], cache=cache)
+    assert(len(cache) == 1)
+    assert(af.linalg.factorize(A, cache=cache) is not fact)
+
+    C = A.copy()
+    fact = af.linalg.factorize(C, cache=cache)
+    C[0, 0] = 2 * n
+    assert(af.linalg.factorize(C, cache=cache) is not fact)
+
+    x = af.linalg.factorize(af.constant(4, 1, 1)).solve(af.constant(2, 1, 1))
+    assert(abs(x.scalar() - 0.5) < 1E-6)
+
+    if af.is_dbl_supported():
+        A64 = A.as_type(af.Dtype.f64)
+        B64 = B.as_type(af.Dtype.f64)
+        for kind in ('lu', 'cholesky'):
+            X = af.linalg.solve_refined(A64, B64, kind=kind)
+            display_func(X)
+            assert(X.dtype() == af.Dtype.f64)
+            assert(af.max(af.abs(af.matmul(A64, X) - B64)) < 1E-10)
+
+    L = af.matmul(af.randu(60, 5), af.randu(5, 40))
+    for mat in (L, af.sparse.create_sparse_from_dense(L)):
+        U, S, Vt = af.linalg.svds(mat, 5)
+        display_func(S)
+        approx = af.matmul(af.matmul(U, af.diag(S, 0, False)), Vt)
+        assert(af.max(af.abs(approx - L)) < 1E-3)
+
+    if af.AF_NUMPY_FOUND:
+        import numpy as np
+        An = np.random.random((30, 20)).astype(np.float32)
+        Bn = np.random.random((20, 25)).astype(np.float32)
+        C = af.linalg.matmul_tiled(An, Bn, block=(8, 6, 10))
+        print_func(C)
+        assert(np.allclose(C, np.dot(An, Bn), atol=1E-4))
+        C = af.linalg.matmul_tiled(af.to_array(An), Bn, block=7)
+        assert(np.allclose(C, np.dot(An, Bn), atol=1E-4))
+
+    T = af.randu(100, 6)
+    _, R_ref, _ = af.qr(T)
+    Q, R = af.linalg.tsqr(T, block_rows=16, return_q=True)
+    display_func(R)
+    assert(af.max(af.abs(af.matmul(Q, R) - T)) < 1E-3)
+    assert(af.max(af.abs(af.matmulTN(Q, Q) - af.identity(6, 6))) < 1E-3)
+    assert(af.max(af.abs(af.abs(R) - af.abs(R_ref[:6, :]))) < 1E-3)
+    R = af.linalg.tsqr([T[:40, :], T[40:90, :], T[90:, :]])
+    assert(af.max(af.abs(af.abs(R) - af.abs(R_ref[:6, :]))) < 1E-3)
+
+_util.tests['linalg'] = simple_linalg
@@ -0,0 +1,37 @@
+#!/usr/bin/python
+#######################################################
+# Copyright (c) 2015, ArrayFire
+# All rights reserved.
+#
+# This file is distributed under 3-clause BSD license.
+# The complete license agreement can be obtained at:
+# http://arrayfire.com/licenses/BSD-3-Clause
+########################################################
+
+import arrayfire as af
+from . import _util
+
+def simple_parallel(verbose=False):
+    display_func = _util.display_func(verbose)
+    print_func   = _util.print_func(verbose)
+
+    sizes = [10, 20, 30, 40, 50]
+    res = af.parallel_map(lambda n: af.constant(1, n), sizes)
+    assert(len(res) == len(sizes))
+    for n, r in zip(sizes, res):
+        assert(r.elements() == n)
+
+    res = af.parallel_map(lambda n: af.sum(af.constant(1, n)), sizes, devices=[af.get_device()])
+    print_func(res)
+    assert(res == sizes)
+
+    def fail(n):
+        raise ValueError("expected failure")
+
+    try:
+        af.parallel_map(fail, sizes)
+        assert(False)
+    except ValueError:
+        pass
+
+_util.tests['parallel'] = simple_parallel
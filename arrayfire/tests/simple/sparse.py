@@ -25,4 +25,47 @@ def simple_sparse(verbose=False):
     print_func(af.sparse_get_nnz(sp))
     print_func(af.sparse_get_storage(sp))
 
+    rows = af.Array([0, 2, 1, 0, 2, 0]).as_type(af.Dtype.s32)
+    cols = af.Array([1, 0, 2, 1, 0, 0]).as_type(af.Dtype.s32)
+    vals = af.Array([1, 2, 3, 4, 5, 6])
+    for storage in (af.STORAGE.CSR, af.STORAGE.COO):
+        sp = af.sparse.assemble(vals, rows, cols, 3, 3, storage)
+        display_func(af.sparse_get_info(sp))
+        assert(af.sparse_get_nnz(sp) == 4)
+        dense = af.convert_sparse_to_dense(sp)
+        assert(dense[0, 1].scalar() == 5 and dense[2, 0].scalar() == 7)
+        assert(af.sum(dense) == 21)
+
+    sp = af.create_sparse_from_dense(ds)
+    d = af.randu(5)
+    display_func(af.sparse_scale(sp, 2))
+    assert(af.max(af.abs(af.convert_sparse_to_dense(af.sparse_scale(sp, 2)) - 2 * ds)) < 1E-5)
+    assert(af.max(af.abs(af.convert_sparse_to_dense(af.sparse_apply(sp, af.sqrt)) - af.sqrt(ds))) < 1E-5)
+    assert(af.max(af.abs(af.convert_sparse_to_dense(af.sparse_scale_rows(sp, d)) - ds * d)) < 1E-5)
+    assert(af.max(af.abs(af.convert_sparse_to_dense(af.sparse_scale_cols(sp, d)) - ds * d.T)) < 1E-5)
+    assert(af.max(af.abs(af.sparse_add(sp, dd) - (ds + dd))) < 1E-5)
+    assert(af.max(af.abs(af.convert_sparse_to_dense(af.sparse_add(sp, sp)) - 2 * ds)) < 1E-5)
+    assert(af.max(af.abs(af.sparse_reduce_rows(sp) - af.sum(ds, 1))) < 1E-5)
+    assert(af.max(af.abs(af.sparse_reduce_rows(sp, 'max') - af.max(ds, 1))) < 1E-5)
+    assert(af.max(af.abs(af.sparse_reduce_rows(sp, 'min') - af.min(ds, 1))) < 1E-5)
+    display_func(af.sparse_reduce_rows(sp, 'count'))
+
+    try:
+        from scipy import sparse as scipy_sparse
+    except ImportError:
+        scipy_sparse = None
+
+    if scipy_sparse is not None:
+        import numpy as np
+        for fmt in ('csr', 'csc', 'coo'):
+            sc = scipy_sparse.random(6, 4, density=0.5, format=fmt, dtype=np.float32)
+            sp = af.sparse.from_scipy(sc)
+            sc2 = af.sparse.to_scipy(sp)
+            assert(sc2.indices.dtype == np.int32 if fmt != 'coo' else sc2.row.dtype == np.int32)
+            assert((sc.toarray() == sc2.toarray()).all())
+            assert((af.convert_sparse_to_dense(sp).to_ndarray() == sc.toarray()).all())
+
+        col = af.create_sparse_from_dense(af.join(0, af.constant(0, 3), af.constant(1, 2)))
+        assert(af.sparse.to_scipy(col).shape == (5, 1))
+
 _util.tests['sparse'] = simple_sparse
@@ -53,4 +53,27 @@ def simple_statistics(verbose=False):
     display_func(values)
     display_func(indices)
 
+    res = af.reduce_many(a)
+    print_func(res)
+    assert(abs(res['sum'] - af.sum(a)) < 1E-3)
+    assert(abs(res['min'] - af.min(a)) < 1E-6)
+    assert(abs(res['max'] - af.max(a)) < 1E-6)
+    assert(res['count'] == af.count(a))
+    assert(abs(res['mean'] - af.mean(a)) < 1E-5)
+    assert(abs(res['var'] - af.var(a)) < 1E-5)
+
+    res = af.reduce_many(a, ('mean', 'var', 'stdev'), dim=0)
+    display_func(res['mean'])
+    display_func(res['var'])
+    display_func(res['stdev'])
+
+    print_func(af.describe(a))
+
+    ints = af.Array([1, 2, 2, 4]).as_type(af.Dtype.s32)
+    res = af.reduce_many(ints, ('sum', 'mean', 'var'))
+    print_func(res)
+    assert(res['sum'] == 9)
+    assert(abs(res['mean'] - 2.25) < 1E-6)
+    assert(abs(res['var'] - af.var(ints)) < 1E-5)
+
 _util.tests['statistics'] = simple_statistics
@@ -0,0 +1,43 @@
+#!/usr/bin/python
+#######################################################
+# Copyright (c) 2015, ArrayFire
+# All rights reserved.
+#
+# This file is distributed under 3-clause BSD license.
+# The complete license agreement can be obtained at:
+# http://arrayfire.com/licenses/BSD-3-Clause
+########################################################
+
+import arrayfire as af
+from . import _util
+
+def simple_stats(verbose=False):
+    display_func = _util.display_func(verbose)
+    print_func   = _util.print_func(verbose)
+
+    a = af.randu(10, 3)
+    b = af.randu(20, 3)
+    c = af.join(0, a, b)
+
+    acc = af.stats.Running()
+    acc.update(a)
+    acc.update(b)
+    print_func(float(acc.mean()), float(acc.var()), float(acc.min()), float(acc.max()))
+    assert(acc.count == 90)
+    assert(abs(float(acc.mean()) - af.mean(c)) < 1E-5)
+    assert(abs(float(acc.var()) - af.var(c)) < 1E-5)
+
+    acc = af.stats.Running(dim=0, cov=True)
+    other = af.stats.Running(dim=0, cov=True)
+    acc.update(a)
+    other.update(b)
+    acc.merge(other)
+    display_func(acc.mean())
+    display_func(acc.stdev())
+    display_func(acc.cov())
+    assert(af.max(af.abs(acc.mean() - af.mean(c, dim=0))) < 1E-5)
+    assert(af.max(af.abs(acc.var() - af.var(c, dim=0))) < 1E-5)
+    assert(af.max(af.abs(acc.min() - af.min(c, 0))) == 0)
+    assert(af.max(af.abs(acc.max() - af.max(c, 0))) == 0)
+
+_util.tests['stats'] = simple_stats
@@ -0,0 +1,55 @@
+#!/usr/bin/python
+#######################################################
+# Copyright (c) 2015, ArrayFire
+# All rights reserved.
+#
+# This file is distributed under 3-clause BSD license.
+# The complete license agreement can be obtained at:
+# http://arrayfire.com/licenses/BSD-3-Clause
+########################################################
+
+import arrayfire as af
+from . import _util
+
+def simple_trace(verbose=False):
+    display_func = _util.display_func(verbose)
+    print_func   = _util.print_func(verbose)
+
+    @af.jit
+    def func(x, y):
+        t = af.exp(x) * 1
+        u = af.exp(x)
+        k = af.constant(2, 5, 5) * 3
+        return (t + u) / k - 0 + y, x > y
+
+    x = af.randu(5, 5)
+    y = af.randu(5, 5)
+    ref = func(x, y)
+    res = func(x, y)
+    display_func(res[0])
+    assert(af.max(af.abs(res[0] - ref[0])) < 1E-5)
+    assert(af.all_true(res[1] == ref[1]))
+
+    a = af.randu(5, 5)
+    b = af.randu(5, 5)
+    res = func(a, b)
+    assert(af.max(af.abs(res[0] - (2 * af.exp(a) / 6 + b))) < 1E-5)
+
+    @af.jit
+    def scale(x):
+        return x / af.sum(x)
+
+    display_func(scale(x))
+    assert(af.max(af.abs(scale(a) - a / af.sum(a))) < 1E-5)
+
+    offset = [af.constant(1, 5, 5)]
+
+    @af.jit
+    def shift(x):
+        return x + offset[0]
+
+    display_func(shift(x))
+    offset[0] = af.constant(2, 5, 5)
+    assert(af.max(af.abs(shift(x) - (x + 2))) < 1E-5)
+
+_util.tests['trace'] = simple_trace
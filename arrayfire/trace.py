@@ -0,0 +1,397 @@
+#######################################################
+# Copyright (c) 2015, ArrayFire
+# All rights reserved.
+#
+# This file is distributed under 3-clause BSD license.
+# The complete license agreement can be obtained at:
+# http://arrayfire.com/licenses/BSD-3-Clause
+########################################################
+
+"""
+Trace element wise functions once and replay them (af.jit).
+"""
+
+from .library import *
+from .array import *
+from .array import _trace_var
+from .device import get_device
+from .device import eval as _eval
+import functools as _functools
+import numbers as _numbers
+
+# C functions that neither create arrays nor read their values
+_passive_funcs = frozenset(['af_get_dims', 'af_get_numdims', 'af_get_type', 'af_get_elements',
+                            'af_is_empty', 'af_is_scalar', 'af_is_row', 'af_is_column',
+                            'af_is_vector', 'af_is_complex', 'af_is_real', 'af_is_double',
+                            'af_is_single', 'af_is_realfloating', 'af_is_floating',
+                            'af_is_integer', 'af_is_bool', 'af_is_sparse', 'af_is_linear',
+                            'af_is_owner', 'af_release_array', 'af_constant',
+                            'af_constant_complex', 'af_constant_long', 'af_constant_ulong',
+                            'af_eval', 'af_eval_multiple', 'af_sync'])
+
+# Number of signatures traced by each function before its plans are discarded
+_JIT_CACHE_SIZE = 64
+
+# x op c == x, if c is the constant below and the output has the same type and size as x
+_right_identity = {'af_sub' : 0, 'af_mul' : 1, 'af_div' : 1, 'af_pow' : 1}
+
+# c op x == x, if c is the constant below and the output has the same type and size as x
+_left_identity = {'af_mul' : 1}
+
+class _Untraceable(Exception):
+    pass
+
+class _traced_lib(object):
+    """
+    Counts the C functions looked up while tracing.
+    """
+    def __init__(self, clib, calls):
+        self._clib = clib
+        self._calls = calls
+
+    def __getattr__(self, name):
+        self._calls[name] = self._calls.get(name, 0) + 1
+        return getattr(self._clib, name)
+
+class _Tracer(object):
+    """
+    Records the operations on arrays performed by the current thread.
+
+    Every value is a node:
+        - ('input', idx)             : positional array argument `idx`.
+        - ('extern', arr)            : array created outside the function. Not replayable.
+        - ('const', val, dims, type) : constant array.
+        - ('fixed', arr)             : result of an operation on constants (folded).
+        - ('op', name, inputs, extra): C function `name` applied to the nodes in `inputs`.
+
+    Nodes are hash consed, so an operation repeated on the same inputs maps to the same node.
+    """
+    def __init__(self):
+        self.nodes = []
+        self.info = []
+        self.keys = {}
+        self.handles = {}
+        self.keep = []
+        self.calls = {}
+        self.recorded = {}
+
+    def hook(self, clib):
+        return _traced_lib(clib, self.calls)
+
+    def _add(self, key, node, info):
+        nid = self.keys.get(key)
+        if nid is None:
+            nid = len(self.nodes)
+            self.nodes.append(node)
+            self.info.append(info)
+            self.keys[key] = nid
+        return nid
+
+    def _node_of(self, arr):
+        nid = self.handles.get(arr.arr.value)
+        if nid is None:
+            self.keep.append(arr)
+            nid = self._add(('extern', id(arr)), ('extern', arr), (arr._dims4(), arr.type()))
+            self.handles[arr.arr.value] = nid
+        return nid
+
+    def _is_const(self, nid, val):
+        node = self.nodes[nid]
+        return val is not None and node[0] == 'const' and node[1] == val
+
+    def input(self, arr, idx):
+        nid = self._add(('input', idx), ('input', idx), (arr._dims4(), arr.type()))
+        self.handles[arr.arr.value] = nid
+
+    def constant(self, handle, val, dims):
+        dims = tuple(1 if d is None else d for d in dims)
+        ty = c_int_t(0)
+        safe_call(backend.get().af_get_type(c_pointer(ty), handle))
+        key = ('const', val, dims, ty.value)
+        self.handles[handle.value] = self._add(key, key, (dims, ty.value))
+
+    def record(self, c_func, out, inputs, extra):
+        name = c_func.__name__
+        self.recorded[name] = self.recorded.get(name, 0) + 1
+
+        ids = tuple(self._node_of(arr) for arr in inputs)
+        info = (out._dims4(), out.type())
+        self.keep.append(out)
+
+        nid = None
+        if len(ids) == 2:
+            lhs, rhs = ids
+            if self._is_const(rhs, _right_identity.get(name)) and self.info[lhs] == info:
+                nid = lhs
+            elif self._is_const(lhs, _left_identity.get(name)) and self.info[rhs] == info:
+                nid = rhs
+
+        if nid is None:
+            if all(self.nodes[i][0] in ('const', 'fixed') for i in ids):
+                nid = self._add(('fixed', name, ids, extra), ('fixed', out), info)
+            else:
+                key = ('op', name, ids, extra)
+                nid = self._add(key, key, info)
+
+        self.handles[out.arr.value] = nid
+
+    def plan(self, outputs):
+        for name, num in self.calls.items():
+            if name not in _passive_funcs and self.recorded.get(name, 0) != num:
+                raise _Untraceable(name)
+
+        # A replay could not see the function reading a different array, e.g. a reassigned global
+        if any(node[0] == 'extern' for node in self.nodes):
+            raise _Untraceable("extern")
+
+        out_ids = []
+        for out in outputs:
+            nid = self.handles.get(out.arr.value)
+            if nid is None:
+                raise _Untraceable("output")
+            out_ids.append(nid)
+
+        return _Plan(self.nodes, self.info, out_ids, [type(out) for out in outputs])
+
+class _Plan(object):
+    """
+    The operations needed to compute the outputs of a traced function.
+    """
+    def __init__(self, nodes, info, out_ids, out_types):
+        clib = backend.get()
+
+        # Dead code elimination
+        live = set()
+        stack = list(out_ids)
+        while stack:
+            nid = stack.pop()
+            if nid in live:
+                continue
+            live.add(nid)
+            if nodes[nid][0] == 'op':
+                stack.extend(nodes[nid][2])
+        order = sorted(live)
+
+        last_use = {}
+        for nid in order:
+            if nodes[nid][0] == 'op':
+                for i in nodes[nid][2]:
+                    last_use[i] = nid
+
+        self.num = len(nodes)
+        self.inputs = []
+        self.arrays = []
+        self.steps = []
+        for nid in order:
+            node = nodes[nid]
+            kind = node[0]
+            if kind == 'input':
+                self.inputs.append((nid, node[1]))
+            elif kind == 'fixed':
+                self.arrays.append((nid, node[1]))
+            elif kind == 'const':
+                dims = node[2]
+                arr = Array()
+                arr.arr = constant_array(node[1], dims[0], dims[1], dims[2], dims[3], node[3])
+                self.arrays.append((nid, arr))
+            else:
+                release = tuple(i for i in set(node[2])
+                                if last_use[i] == nid and nodes[i][0] == 'op' and i not in out_ids)
+                self.steps.append((nid, getattr(clib, node[1]), node[2], node[3], release))
+
+        self.outputs = out_ids
+        self.out_types = out_types
+        self.owned = [nodes[nid][0] == 'op' and out_ids.index(nid) == n
+                      for n, nid in enumerate(out_ids)]
+
+        # af.eval of several arrays requires equal sizes and types
+        groups = {}
+        for n, nid in enumerate(out_ids):
+            groups.setdefault(info[nid], []).append(n)
+        self.groups = list(groups.values())
+
+        self.release = clib.af_release_array
+        self.retain = clib.af_retain_array
+
+    def run(self, arrays):
+        vals = [None] * self.num
+        for nid, idx in self.inputs:
+            vals[nid] = arrays[idx].arr
+        for nid, arr in self.arrays:
+            vals[nid] = arr.arr
+
+        created = []
+        try:
+            for nid, func, ins, extra, release in self.steps:
+                out = c_void_ptr_t(0)
+                safe_call(func(c_pointer(out), *([vals[i] for i in ins] + list(extra))))
+                vals[nid] = out
+                created.append(nid)
+                for i in release:
+                    safe_call(self.release(vals[i]))
+                    vals[i] = None
+        except:
+            for nid in created:
+                if vals[nid] is not None and nid not in self.outputs:
+                    self.release(vals[nid])
+            raise
+
+        outs = []
+        for n, nid in enumerate(self.outputs):
+            res = self.out_types[n]()
+            if self.owned[n]:
+                res.arr = vals[nid]
+            else:
+                safe_call(self.retain(c_pointer(res.arr), vals[nid]))
+            outs.append(res)
+
+        for group in self.groups:
+            _eval(*[outs[n] for n in group])
+
+        return outs
+
+def _signature(args, kwargs):
+    key = []
+    arrays = []
+    aliases = {}
+    values = list(args) + [kwargs[name] for name in sorted(kwargs)]
+    for val in values:
+        if isinstance(val, Array):
+            alias = aliases.setdefault(val.arr.value, len(arrays))
+            key.append((type(val), val._dims4(), val.type(), alias))
+            arrays.append(val)
+        elif val is None or isinstance(val, (_numbers.Number, str)):
+            key.append((type(val), val))
+        else:
+            return None, None
+    return tuple(key) + tuple(sorted(kwargs)), arrays
+
+def _flatten(res):
+    if type(res) in (Array, DeviceScalar):
+        return [res], None
+    if isinstance(res, (tuple, list)) and all(type(r) in (Array, DeviceScalar) for r in res):
+        return list(res), type(res)
+    return None, None
+
+def _eval_outputs(outputs):
+    groups = {}
+    for out in outputs:
+        groups.setdefault((out._dims4(), out.type()), []).append(out)
+    for group in groups.values():
+        _eval(*group)
+
+def _trace(func, args, kwargs, arrays):
+    tracer = _Tracer()
+    for idx, arr in enumerate(arrays):
+        tracer.input(arr, idx)
+
+    _trace_var.tracer = tracer
+    backend._set_thread_hook(tracer.hook)
+    try:
+        res = func(*args, **kwargs)
+    finally:
+        _trace_var.tracer = None
+        backend._set_thread_hook(None)
+
+    outputs, structure = _flatten(res)
+    if outputs is None:
+        return res, None
+
+    try:
+        plan = tracer.plan(outputs)
+    except _Untraceable:
+        plan = None
+    else:
+        plan.structure = structure
+
+    _eval_outputs(outputs)
+    return res, plan
+
+def jit(func):
+    """
+    Decorator that traces a function of arrays and replays the recorded operations.
+
+    On the first call for each signature (sizes and types of the array arguments
+    and the values of the other arguments), `func` runs normally while the
+    element wise operations it performs are recorded. Repeated sub expressions
+    are merged, operations on constants are folded, trivial operations
+    (x - 0, x * 1, x / 1, x ** 1) are removed, and the operations that do not
+    contribute to the outputs are dropped. Later calls with the same signature
+    issue only the remaining C calls, without running `func` and without
+    creating the intermediate af.Array objects. The outputs are always evaluated.
+
+    Parameters
+    ----------
+
+    func : callable.
+         A function taking af.Array, numbers or strings as arguments and
+         returning an af.Array or a tuple / list of af.Array.
+
+    Returns
+    -------
+
+    wrapper : callable.
+            The traced version of `func`.
+
+    Note
+    ----
+
+    - Arithmetic operators, comparisons, the functions in arrayfire.arith
+      (including cast and clamp) and af.constant can be traced.
+    - If `func` does anything else with its arguments (for example indexing,
+      matmul, reductions or reading values to the host), it is called normally
+      for that signature and nothing is cached.
+    - If `func` uses arrays that are not its arguments (for example globals),
+      it is called normally for that signature and nothing is cached, because
+      a replay would keep using the arrays seen when tracing.
+    - Python control flow is recorded for the values seen when tracing. It must
+      depend only on the signature.
+    - Numbers are part of the signature and become constants of the plan.
+      Pass values that change from call to call as arrays, or every call is
+      traced again. Each function keeps the plans of up to 64 signatures.
+
+    Examples
+    --------
+
+    >>> import arrayfire as af
+    >>> @af.jit
+    ... def saxpy(a, x, y):
+    ...     return a * x + y
+    ...
+    >>> x = af.randu(100)
+    >>> y = af.randu(100)
+    >>> z = saxpy(2.0, x, y) # traced
+    >>> z = saxpy(2.0, y, x) # replayed
+
+    """
+    plans = {}
+    untraced = object()
+
+    @_functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        # Calls inside a trace become part of the outer trace
+        if _trace_var.tracer is not None:
+            return func(*args, **kwargs)
+
+        key, arrays = _signature(args, kwargs)
+        if key is None:
+            return func(*args, **kwargs)
+
+        key = (backend.name(), get_device()) + key
+        plan = plans.get(key, untraced)
+
+        if plan is None:
+            return func(*args, **kwargs)
+
+        if plan is untraced:
+            res, plan = _trace(func, args, kwargs, arrays)
+            if len(plans) >= _JIT_CACHE_SIZE:
+                plans.clear()
+            plans[key] = plan
+            return res
+
+        outs = plan.run(arrays)
+        return outs[0] if plan.structure is None else plan.structure(outs)
+
+    wrapper.clear_cache = plans.clear
+    return wrapper
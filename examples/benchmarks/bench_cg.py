@@ -35,13 +35,7 @@ def to_sparse(A):
 
 
 def to_scipy_sparse(spA, fmt='csr'):
-    vals = np.asarray(af.sparse.sparse_get_values(spA).to_list(),
-                      dtype = np.float32)
-    rows = np.asarray(af.sparse.sparse_get_row_idx(spA).to_list(),
-                      dtype = np.int)
-    cols = np.asarray(af.sparse.sparse_get_col_idx(spA).to_list(),
-                      dtype = np.int)
-    return sp.csr_matrix((vals, cols, rows), dtype=np.float32)
+    return af.sparse.to_scipy(spA)
 
 
 def setup_input(n, sparsity=7):
@@ -75,11 +69,18 @@ def calc_arrayfire(A, b, x0, maxiter=10):
         alpha_num = af.dot(r, r)
         alpha_den = af.dot(p, Ap)
         alpha = alpha_num/alpha_den
-        r -= af.tile(alpha, Ap.dims()[0]) * Ap
-        x += af.tile(alpha, Ap.dims()[0]) * p
+        r -= alpha * Ap
+        x += alpha * p
         beta_num = af.dot(r, r)
         beta = beta_num/alpha_num
-        p = r + af.tile(beta, p.dims()[0]) * p
+        p = r + beta * p
+    af.eval(x)
+    res = x0 - x
+    return x, af.dot(res, res)
+
+
+def calc_arrayfire_linalg_cg(A, b, x0, maxiter=10):
+    x, _ = af.linalg.cg(A, b, tol=0., maxiter=maxiter, check_every=maxiter)
     af.eval(x)
     res = x0 - x
     return x, af.dot(res, res)
@@ -144,6 +145,9 @@ def test():
     x2, _ = calc_arrayfire(Asp, b, x0)
     if af.sum(af.abs(x1 - x2)/x2 > 1e-5):
         raise ValueError("arrayfire test failed")
+    x6, _ = calc_arrayfire_linalg_cg(Asp, b, x0)
+    if af.sum(af.abs(x1 - x6)/x6 > 1e-4):
+        raise ValueError("arrayfire linalg.cg test failed")
     if np:
         An = to_numpy(A)
         bn = to_numpy(b)
@@ -176,6 +180,8 @@ def bench(n=4*1024, sparsity=7, maxiter=10, iters=10):
     print("    arrayfire - dense:            %f ms" %t1)
     t2 = timeit(calc_arrayfire, iters, args=(Asp, b, x0, maxiter))
     print("    arrayfire - sparse:           %f ms" %t2)
+    t6 = timeit(calc_arrayfire_linalg_cg, iters, args=(Asp, b, x0, maxiter))
+    print("    arrayfire - sparse linalg.cg: %f ms" %t6)
     if np:
         An = to_numpy(A)
         bn = to_numpy(b)
@@ -0,0 +1,47 @@
+#!/usr/bin/python
+
+#######################################################
+# Copyright (c) 2015, ArrayFire
+# All rights reserved.
+#
+# This file is distributed under 3-clause BSD license.
+# The complete license agreement can be obtained at:
+# http://arrayfire.com/licenses/BSD-3-Clause
+########################################################
+
+
+import sys
+import subprocess
+from time import time
+
+
+def calc_import(stmt):
+
+    code = "from time import time; start = time(); %s; print(time() - start)" % stmt
+
+    def run(iters):
+        total = 0
+        for t in range(iters):
+            # A new interpreter for every run, so that nothing is cached in sys.modules
+            out = subprocess.check_output([sys.executable, "-c", code])
+            total += float(out.decode().strip())
+        return total
+
+    return run
+
+
+def bench(stmt, iters = 10):
+    run = calc_import(stmt)
+    t = run(iters) / iters
+    print("Time taken for %-50s: %0.2f ms" % (stmt, t * 1E3))
+
+
+if __name__ == "__main__":
+
+    iters = int(sys.argv[1]) if (len(sys.argv) > 1) else 10
+
+    bench("import arrayfire", iters)
+    bench("import arrayfire; arrayfire.Window", iters)
+    bench("import arrayfire; arrayfire.sparse", iters)
+    bench("import arrayfire; arrayfire.to_array", iters)
+    bench("import arrayfire; arrayfire.get_active_backend()", iters)